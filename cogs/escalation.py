@@ -1,29 +1,51 @@
 import discord
 from discord.ext import commands, tasks
+import asyncio
 import logging
 import time
 from datetime import datetime, timezone
 from typing import Optional
 
+from utils import config_cache
 from utils import database_handler as db
 from utils import embed_factory
 
+MAX_CONCURRENT_THREAD_CHECKS = 32  # Keeps the hourly sweep well inside Discord rate limits
+THREAD_STATE_RETENTION_DAYS = 30
+SUPPORT_HISTORY_SCAN_LIMIT = 100  # One page of history per request
+
+# Static parts of the escalation embeds; per-call text and fields are merged in with Embed.from_dict
+TIER_1_EMBED_TEMPLATE = {
+    'title': "⏰ Thread Needs Attention - Tier 1",
+    'color': embed_factory.INFO_COLOR
+}
+TIER_2_EMBED_TEMPLATE = {
+    'title': "🚨 Thread Escalation - Tier 2",
+    'color': embed_factory.ERROR_COLOR
+}
+
 class EscalationCog(commands.Cog):
     """Handles stale thread escalation with tier-based alerts."""
     
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.check_stale_threads.start()
+        self.prune_thread_state.start()
 
     def cog_unload(self):
         self.check_stale_threads.cancel()
+        self.prune_thread_state.cancel()
 
     async def is_monitored_thread(self, thread: discord.Thread) -> bool:
         """Check if the thread is in a monitored forum."""
         if not isinstance(thread, discord.Thread) or not thread.parent:
             return False
         
-        config = await db.get_guild_config(thread.guild.id)
+        # Cheap in-memory check first; most threads are in unmonitored forums
+        if thread.parent_id not in self.bot.monitored_parents:
+            return False
+        
+        config = await config_cache.get_config(thread.guild.id)
         if not config or not config.get('monitored_channels'):
             return False
         
@@ -45,9 +67,12 @@ class EscalationCog(commands.Cog):
             pass
         return None
 
-    async def execute_tier_1_escalation(self, thread: discord.Thread, settings: dict):
+    async def execute_tier_1_escalation(self, thread: discord.Thread, settings: dict, created_ts: Optional[float] = None):
         """Execute tier 1 escalation - ping support roles in thread."""
         try:
+            if created_ts is None:
+                created_ts = thread.created_at.timestamp()
+
             role_id = settings['tier_1_role_id']
             guild = thread.guild
             role = guild.get_role(role_id)
@@ -56,22 +81,23 @@ class EscalationCog(commands.Cog):
                 logging.warning(f"Tier 1 role {role_id} not found in guild {guild.id}")
                 return False
             
-            embed = discord.Embed(
-                title="⏰ Thread Needs Attention - Tier 1",
-                description=(
+            embed = discord.Embed.from_dict({
+                **TIER_1_EMBED_TEMPLATE,
+                'description': (
                     f"This thread has been waiting for a response for "
-                    f"**{settings['tier_1_hours']} hours** without any support team replies.\\n\\n"
+                    f"**{settings['tier_1_hours']} hours** without any support team replies.\n\n"
                     f"Please review and assist if needed."
                 ),
-                color=embed_factory.INFO_COLOR
-            )
-            embed.add_field(name="Thread", value=f"[{thread.name}]({thread.jump_url})", inline=False)
-            embed.add_field(name="Created", value=f"<t:{int(thread.created_at.timestamp())}>", inline=True)
-            embed.add_field(name="Last Activity", value=f"<t:{int(time.time())}>", inline=True)
+                'fields': [
+                    {'name': "Thread", 'value': f"[{thread.name}]({thread.jump_url})", 'inline': False},
+                    {'name': "Created", 'value': f"<t:{int(created_ts)}>", 'inline': True},
+                    {'name': "Last Activity", 'value': f"<t:{int(time.time())}>", 'inline': True}
+                ]
+            })
             
             # Send role ping OUTSIDE the embed
             await thread.send(content=f"{role.mention}", embed=embed)
-            await db.mark_escalation_tier_executed(thread.id, 1)
+            await db.mark_escalation_tier_executed(thread.id, 1, thread.guild.id)
             
             logging.info(f"Executed tier 1 escalation for thread {thread.id}")
             return True
@@ -83,9 +109,12 @@ class EscalationCog(commands.Cog):
             logging.error(f"Error executing tier 1 escalation for thread {thread.id}: {e}")
             return False
 
-    async def execute_tier_2_escalation(self, thread: discord.Thread, settings: dict):
+    async def execute_tier_2_escalation(self, thread: discord.Thread, settings: dict, created_ts: Optional[float] = None):
         """Execute tier 2 escalation - ping role in escalation channel."""
         try:
+            if created_ts is None:
+                created_ts = thread.created_at.timestamp()
+
             role_id = settings['tier_2_role_id']
             channel_id = settings['escalation_channel_id']
             guild = thread.guild
@@ -101,24 +130,24 @@ class EscalationCog(commands.Cog):
                 logging.warning(f"Escalation channel {channel_id} not found in guild {guild.id}")
                 return False
             
-            embed = discord.Embed(
-                title="🚨 Thread Escalation - Tier 2",
-                description=(
-                    f"**Urgent:** Thread requires immediate attention!\\n\\n"
+            embed = discord.Embed.from_dict({
+                **TIER_2_EMBED_TEMPLATE,
+                'description': (
+                    f"**Urgent:** Thread requires immediate attention!\n\n"
                     f"This thread has been waiting for "
                     f"**{settings['tier_2_hours']} hours** without support team responses."
                 ),
-                color=embed_factory.ERROR_COLOR
-            )
-            
-            embed.add_field(name="Thread", value=f"[{thread.name}]({thread.jump_url})", inline=False)
-            embed.add_field(name="Forum", value=thread.parent.mention if thread.parent else "Unknown", inline=True)
-            embed.add_field(name="Author", value=thread.owner.mention if thread.owner else "Unknown", inline=True)
-            embed.add_field(name="Created", value=f"<t:{int(thread.created_at.timestamp())}>", inline=True)
+                'fields': [
+                    {'name': "Thread", 'value': f"[{thread.name}]({thread.jump_url})", 'inline': False},
+                    {'name': "Forum", 'value': thread.parent.mention if thread.parent else "Unknown", 'inline': True},
+                    {'name': "Author", 'value': thread.owner.mention if thread.owner else "Unknown", 'inline': True},
+                    {'name': "Created", 'value': f"<t:{int(created_ts)}>", 'inline': True}
+                ]
+            })
             
             # Send role ping OUTSIDE the embed for proper notifications
             await channel.send(content=f"{role.mention}", embed=embed)
-            await db.mark_escalation_tier_executed(thread.id, 2)
+            await db.mark_escalation_tier_executed(thread.id, 2, thread.guild.id)
             
             logging.info(f"Executed tier 2 escalation for thread {thread.id}")
             return True
@@ -133,94 +162,140 @@ class EscalationCog(commands.Cog):
     @tasks.loop(hours=1)  # Check every hour
     async def check_stale_threads(self):
         """Background task to check for stale threads and execute escalations."""
-        try:
-            current_time = time.time()
+        current_time = time.time()
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_THREAD_CHECKS)
+        
+        # Get all guilds that might need escalation; a failure in one guild doesn't stop the sweep
+        for guild in self.bot.guilds:
+            try:
+                await self.check_guild_stale_threads(guild, current_time, semaphore)
+            except Exception as e:
+                logging.error(f"Error in stale thread check for guild {guild.id}: {e}")
+
+    async def check_guild_stale_threads(self, guild: discord.Guild, current_time: float, semaphore: asyncio.Semaphore):
+        """Check every active thread in a guild's monitored forums for escalation needs."""
+        # Get guild config and escalation settings in one cached lookup
+        bundle = await config_cache.get_bundle(guild.id)
+        if not bundle:
+            return
+        
+        escalation_settings = bundle['escalation']
+        if not escalation_settings or not escalation_settings.get('enabled'):
+            return
+        
+        # Get monitored forums for this guild
+        config = bundle['config']
+        if not config.get('monitored_channels'):
+            return
+        
+        # Collect every active thread across the monitored forums
+        threads = []
+        for forum_id in config['monitored_channels']:
+            forum = guild.get_channel(forum_id)
             
-            # Get all guilds that might need escalation
-            for guild in self.bot.guilds:
-                # Get guild-wide escalation settings
-                escalation_settings = await db.get_guild_escalation_settings(guild.id)
-                
-                if not escalation_settings or not escalation_settings.get('enabled'):
-                    continue
-                
-                # Get monitored forums for this guild
-                config = await db.get_guild_config(guild.id)
-                if not config or not config.get('monitored_channels'):
-                    continue
-                
-                # Check each monitored forum
-                for forum_id in config['monitored_channels']:
-                    forum = guild.get_channel(forum_id)
-                    
-                    if not forum or not isinstance(forum, discord.ForumChannel):
-                        continue
-                    
-                    # Check each active thread in the forum
-                    for thread in forum.threads:
-                        if thread.archived or thread.locked:
-                            continue
-                        
-                        await self.check_thread_for_escalation(thread, escalation_settings, current_time)
-                        
-        except Exception as e:
-            logging.error(f"Error in stale thread check task: {e}")
+            if not forum or not isinstance(forum, discord.ForumChannel):
+                continue
+            
+            threads.extend(thread for thread in forum.threads if not (thread.archived or thread.locked))
+        
+        if not threads:
+            return
+        
+        # Fetch escalation state for all of them in one query
+        states = await db.get_thread_escalation_states_bulk([thread.id for thread in threads])
+        
+        # Rows migrated from the old schema have no guild yet; claim the ones that belong to this guild
+        orphaned = [thread_id for thread_id, state in states.items() if state['guild_id'] is None]
+        if orphaned:
+            await db.backfill_thread_guild_ids(guild.id, orphaned)
+        
+        # Thread checks are independent I/O, so run them concurrently
+        await asyncio.gather(*(
+            self.check_thread_limited(semaphore, thread, escalation_settings, current_time,
+                                      states.get(thread.id), config, thread.created_at.timestamp())
+            for thread in threads
+        ), return_exceptions=True)
+
+    async def check_thread_limited(self, semaphore: asyncio.Semaphore, *args):
+        """Run check_thread_for_escalation while holding a slot of the sweep's semaphore."""
+        async with semaphore:
+            await self.check_thread_for_escalation(*args)
 
-    async def check_thread_for_escalation(self, thread: discord.Thread, settings: dict, current_time: float):
+    async def check_thread_for_escalation(self, thread: discord.Thread, settings: dict, current_time: float,
+                                          state: Optional[dict] = None, config: Optional[dict] = None,
+                                          created_ts: Optional[float] = None):
         """Check a specific thread for escalation needs."""
         try:
-            # Get thread escalation state
-            state = await db.get_thread_escalation_state(thread.id)
+            if created_ts is None:
+                created_ts = thread.created_at.timestamp()
             
+
             # If no state exists (thread reset or first time), create default state
             if not state:
-                state = {'tier_1_executed': False, 'tier_2_executed': False}
+                state = {'tier_flags': 0}
             
             # Check if support has ever replied to this thread
-            has_support_reply = await self.has_support_ever_replied(thread, settings)
+            has_support_reply = await self.has_support_ever_replied(thread, settings, config)
             
             if has_support_reply:
                 return  # Support has replied, no escalation needed
             
             # Since support hasn't replied, escalate based on thread age
-            thread_age_hours = (current_time - thread.created_at.timestamp()) / 3600
+            thread_age_hours = (current_time - created_ts) / 3600
             
             # Check tier 2 escalation (higher priority)
-            if (not state.get('tier_2_executed', False) and 
+            if (not state['tier_flags'] & db.TIER_2_FLAG and 
                 thread_age_hours >= settings['tier_2_hours']):
                 logging.info(f"Escalating thread {thread.id} to tier 2 (age: {thread_age_hours:.1f}h)")
-                await self.execute_tier_2_escalation(thread, settings)
+                await self.execute_tier_2_escalation(thread, settings, created_ts)
             
             # Check tier 1 escalation
-            elif (not state.get('tier_1_executed', False) and 
+            elif (not state['tier_flags'] & db.TIER_1_FLAG and 
                   thread_age_hours >= settings['tier_1_hours']):
                 logging.info(f"Escalating thread {thread.id} to tier 1 (age: {thread_age_hours:.1f}h)")
-                await self.execute_tier_1_escalation(thread, settings)
+                await self.execute_tier_1_escalation(thread, settings, created_ts)
                 
         except Exception as e:
             logging.error(f"Error checking thread {thread.id} for escalation: {e}")
 
-    async def has_support_ever_replied(self, thread: discord.Thread, settings: dict) -> bool:
+    async def has_support_ever_replied(self, thread: discord.Thread, settings: dict, config: Optional[dict] = None) -> bool:
         """Check if support has ever replied to this thread."""
         try:
+            # Support replies are recorded by on_message, so this is normally a single DB read
+            state = await db.get_thread_support_state(thread.id)
+            if state:
+                # NULL means an earlier backfill was cut off before finding a reply; treat it as answered
+                # rather than escalating a long thread whose reply may sit outside the scanned window
+                return state['has_support_reply'] is None or bool(state['has_support_reply'])
+            
             # Get support roles for permission checking
-            config = await db.get_guild_config(thread.guild.id)
-            support_role_ids = set(config.get('support_roles', [])) if config else set()
+            if config is None:
+                config = await config_cache.get_config(thread.guild.id)
+            support_role_ids = config['support_roles'] if config else frozenset()
             
             if not support_role_ids:
                 return False  # No support roles configured
             
-            async for message in thread.history(limit=None):  # Check all messages
+            # First time seeing this thread - backfill from a single page of history
+            scanned = 0
+            async for message in thread.history(limit=SUPPORT_HISTORY_SCAN_LIMIT):
+                scanned += 1
                 # Skip OP and bot messages
                 if message.author.id == thread.owner_id or message.author.bot:
                     continue
                 
                 # Check if author has support role
-                if hasattr(message.author, 'roles'):
-                    author_role_ids = {role.id for role in message.author.roles}
-                    if not support_role_ids.isdisjoint(author_role_ids):
+                if isinstance(message.author, discord.Member):
+                    if not support_role_ids.isdisjoint(role.id for role in message.author.roles):
+                        await db.set_thread_support_replied(thread.id, int(message.created_at.timestamp()))
                         return True  # Found support reply
             
+            if scanned >= SUPPORT_HISTORY_SCAN_LIMIT:
+                # Older messages weren't checked, so only record that the answer is unknown
+                await db.init_thread_support_state(thread.id, None)
+                return True
+            
+            await db.init_thread_support_state(thread.id, False)
             return False  # No support replies found
             
         except discord.Forbidden:
@@ -250,25 +325,42 @@ class EscalationCog(commands.Cog):
             return
         
         # Get support roles
-        config = await db.get_guild_config(thread.guild.id)
+        config = await config_cache.get_config(thread.guild.id)
         if not config:
             return
         
-        support_role_ids = set(config.get('support_roles', []))
+        support_role_ids = config['support_roles']
         
         # Check if message author has support role
-        if hasattr(message.author, 'roles'):
-            author_role_ids = {role.id for role in message.author.roles}
-            is_support_member = not support_role_ids.isdisjoint(author_role_ids)
+        if isinstance(message.author, discord.Member):
+            is_support_member = any(role.id in support_role_ids for role in message.author.roles)
             
             if is_support_member:
-                # Support member responded - reset escalation state completely
+                # Support member responded - remember it and reset escalation state completely
+                await db.set_thread_support_replied(thread.id, int(message.created_at.timestamp()))
                 await db.reset_thread_escalation_state(thread.id)
 
+    @tasks.loop(hours=24)
+    async def prune_thread_state(self):
+        """Background task to delete stored state for threads that have gone quiet."""
+        try:
+            # Never prune threads that are still live, or they could be escalated a second time
+            active_thread_ids = [thread.id for guild in self.bot.guilds for thread in guild.threads]
+            deleted = await db.prune_thread_states(THREAD_STATE_RETENTION_DAYS, active_thread_ids)
+            if deleted:
+                logging.info(f"Pruned {deleted} stale thread state rows")
+        except Exception as e:
+            logging.error(f"Error in thread state prune task: {e}")
+
     @check_stale_threads.before_loop
     async def before_check_stale_threads(self):
         """Wait for bot to be ready before starting the task."""
         await self.bot.wait_until_ready()
 
+    @prune_thread_state.before_loop
+    async def before_prune_thread_state(self):
+        """Wait for bot to be ready before starting the task."""
+        await self.bot.wait_until_ready()
+
 async def setup(bot: commands.Bot):
     await bot.add_cog(EscalationCog(bot))
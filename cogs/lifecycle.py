@@ -1,7 +1,10 @@
 import discord
 from discord.ext import commands
+import asyncio
+import contextlib
 import logging
 
+from utils import config_cache
 from utils import database_handler as db
 from utils import embed_factory
 
@@ -10,17 +13,31 @@ class LifecycleCog(commands.Cog):
     
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        # thread_id -> [lock, handlers holding or waiting on it]; dropped once idle
+        self._thread_locks = {}
+
+    @contextlib.asynccontextmanager
+    async def thread_lock(self, thread_id: int):
+        """Serializes update handling per thread so a close and a quick reopen apply in event order."""
+        entry = self._thread_locks.get(thread_id)
+        if entry is None:
+            entry = self._thread_locks[thread_id] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                self._thread_locks.pop(thread_id, None)
 
     async def can_mark_solved(self, user: discord.Member, guild_id: int) -> bool:
         """Check if user has permission to mark threads as solved (must have support role)."""
-        config = await db.get_guild_config(guild_id)
+        config = await config_cache.get_config(guild_id)
         if not config or not config.get('support_roles'):
             return False
         
-        user_role_ids = {role.id for role in user.roles}
-        support_role_ids = set(config['support_roles'])
-        
-        return not support_role_ids.isdisjoint(user_role_ids)
+        return not config['support_roles'].isdisjoint(role.id for role in user.roles)
 
     async def get_thread_permissions(self, thread: discord.Thread) -> tuple[bool, bool]:
         """Returns (can_archive, can_manage) permissions for the bot in the thread."""
@@ -38,7 +55,9 @@ class LifecycleCog(commands.Cog):
             return False
         
         try:
-            # Post closure message if we can
+            # Post closure message if we can. This must complete before the archive below:
+            # sending into an archived thread would unarchive it again, so the two calls
+            # cannot be issued concurrently.
             if can_manage:
                 embed = embed_factory.thread_closed_embed(user)
                 await thread.send(embed=embed)
@@ -64,7 +83,7 @@ class LifecycleCog(commands.Cog):
             return False
         
         try:
-            # Unarchive and unlock the thread
+            # Unarchive and unlock the thread first so the reopening message lands in an open thread
             await thread.edit(archived=False, locked=False)
             
             # Post reopening message if we can
@@ -85,8 +104,14 @@ class LifecycleCog(commands.Cog):
     @commands.Cog.listener()
     async def on_thread_update(self, before: discord.Thread, after: discord.Thread):
         """Handles thread updates, specifically tag changes for solution management."""
+        # Taken before any await so events for the same thread are handled in dispatch order
+        async with self.thread_lock(after.id):
+            await self.handle_thread_update(before, after)
+
+    async def handle_thread_update(self, before: discord.Thread, after: discord.Thread):
+        """Closes or reopens a monitored thread when its solution tags change."""
         # Only process threads in monitored forums
-        config = await db.get_guild_config(after.guild.id)
+        config = await config_cache.get_config(after.guild.id)
         if not config or not config.get('monitored_channels'):
             return
         
@@ -111,18 +136,24 @@ class LifecycleCog(commands.Cog):
         solution_tags_removed = removed_tags.intersection(solution_tag_ids)
         
         if solution_tags_added:
-            # Thread was marked as solved - mark it as managed and archive
-            await db.add_managed_solution_thread(after.id, "tag_added")
-            # We need to find who made this change - this is tricky with thread updates
-            # For now, we'll use the bot user, but this could be enhanced with audit logs
-            await self.archive_thread(after, after.guild.me)
+            await self.close_solved_thread(after)
             
         elif solution_tags_removed:
-            # Thread was unmarked as solved - only respond if we were managing it
-            if await db.is_thread_managed(after.id):
-                await self.unarchive_thread(after)
-                # Remove from managed threads since it's no longer solved
-                await db.remove_managed_solution_thread(after.id)
+            await self.reopen_unsolved_thread(after)
+
+    async def close_solved_thread(self, thread: discord.Thread):
+        """Marks a thread as managed and archives it after a solution tag was added."""
+        await db.add_managed_solution_thread(thread.id, "tag_added")
+        # We need to find who made this change - this is tricky with thread updates
+        # For now, we'll use the bot user, but this could be enhanced with audit logs
+        await self.archive_thread(thread, thread.guild.me)
+
+    async def reopen_unsolved_thread(self, thread: discord.Thread):
+        """Unarchives a thread after its solution tag was removed, if the bot was managing it."""
+        if await db.is_thread_managed(thread.id):
+            await self.unarchive_thread(thread)
+            # Remove from managed threads since it's no longer solved
+            await db.remove_managed_solution_thread(thread.id)
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(LifecycleCog(bot))
\ No newline at end of file
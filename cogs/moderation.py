@@ -1,47 +1,15 @@
 
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 import logging
-from collections import defaultdict
-import time
 
-from utils import database_handler as db
+from utils import config_cache
 from utils import embed_factory
 
-CACHE_EXPIRY_SECONDS = 300  # 5 minutes
-
 class ModerationCog(commands.Cog):
     """Handles the core moderation logic of the bot."""
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.guild_cache = defaultdict(lambda: {'expiry': 0, 'data': None})
-        self.cleanup_cache.start()
-
-    def clear_guild_cache(self, guild_id: int):
-        """Clears the configuration cache for a specific guild."""
-        if guild_id in self.guild_cache:
-            del self.guild_cache[guild_id]
-            logging.info(f"Cache cleared for guild ID: {guild_id}")
-
-    async def get_cached_config(self, guild_id: int) -> dict:
-        """Retrieves guild configuration from cache or database."""
-        cache_entry = self.guild_cache[guild_id]
-        if cache_entry['expiry'] > time.time():
-            return cache_entry['data']
-
-        config = await db.get_guild_config(guild_id)
-        if config:
-            self.guild_cache[guild_id] = {'expiry': time.time() + CACHE_EXPIRY_SECONDS, 'data': config}
-            return config
-        return None
-
-    @tasks.loop(minutes=10)
-    async def cleanup_cache(self):
-        """Periodically cleans up expired entries from the cache."""
-        current_time = time.time()
-        expired_guilds = [gid for gid, data in self.guild_cache.items() if data['expiry'] <= current_time]
-        for guild_id in expired_guilds:
-            del self.guild_cache[guild_id]
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
@@ -49,8 +17,12 @@ class ModerationCog(commands.Cog):
         if message.author.bot or not message.guild or not isinstance(message.channel, discord.Thread):
             return
 
+        # Skip the config lookup entirely for threads outside any monitored forum
+        if message.channel.parent_id not in self.bot.monitored_parents:
+            return
+
         # 2. Configuration Cache & Lookup
-        config = await self.get_cached_config(message.guild.id)
+        config = await config_cache.get_config(message.guild.id)
         if not config or not config.get('monitored_channels'):
             return
 
@@ -64,9 +36,8 @@ class ModerationCog(commands.Cog):
             return
 
         # Condition 2: Author has a designated support role
-        support_role_ids = set(config.get('support_roles', []))
-        author_role_ids = {role.id for role in message.author.roles}
-        if not support_role_ids.isdisjoint(author_role_ids):
+        support_role_ids = config['support_roles']
+        if any(role.id in support_role_ids for role in message.author.roles):
             return
 
         # 4. Execution
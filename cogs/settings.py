@@ -1,58 +1,53 @@
 import discord
 from discord.ext import commands
 from discord import app_commands, ForumChannel, Role
+import asyncio
+import itertools
 import logging
 import re
+import time
+from typing import Awaitable, Optional
 
+from utils import config_cache
 from utils import database_handler as db
 from utils import embed_factory
 
+# How long a guild's rendered autocomplete choices are reused between keystrokes
+AUTOCOMPLETE_CACHE_SECONDS = 5.0
+AUTOCOMPLETE_CACHE_MAX_ENTRIES = 1_000
+
+# Matches patterns like: 1h, 30m, 2d, 1.5h, 90 minutes, 2 weeks, etc.
+_TIME_RE = re.compile(
+    r'^\s*(\d+(?:\.\d+)?)\s*(s|secs?|seconds?|m|mins?|minutes?|h|hrs?|hours?|d|days?|w|weeks?)?\s*$',
+    re.IGNORECASE
+)
+# Seconds per unit, keyed by the unit's first letter
+_UNIT_SECONDS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+# Escalation behavior descriptions that don't depend on the configured delay
+_BEHAVIOR_DESCRIPTIONS = {
+    "support_only": "Only support team responses prevent escalation",
+    "community_friendly": "Any community response prevents escalation",
+}
+_BEHAVIOR_LABELS = {
+    'support_only': '🎯 Support Only',
+    'community_friendly': '🤝 Community Friendly',
+}
+
 class SettingsCog(commands.Cog):
     """Handles all slash command interactions for configuring the bot."""
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        # (guild_id, kind, ...) -> (built_at, [(lowercased name, choice), ...]) for autocomplete handlers
+        self._ac_cache = {}
+        # forum_id -> (tag signature, tags by ID, tags by lowercased name)
+        self._tag_index_cache = {}
+        # The help text never changes, so build it once
+        self._help_embed = self._build_help_embed()
 
-    def parse_time_to_hours(self, time_str: str) -> int:
-        """Parse time string like '1h', '30m', '2d' to hours."""
-        time_str = time_str.lower().strip()
-        
-        # Match patterns like: 1h, 30m, 2d, 1.5h, etc.
-        match = re.match(r'^(\d+(?:\.\d+)?)\s*([smhd])$', time_str)
-        
-        if not match:
-            # If no unit provided, assume hours
-            try:
-                return int(float(time_str))
-            except ValueError:
-                raise ValueError(f"Invalid time format: '{time_str}'. Use formats like '1h', '30m', '2d'")
-        
-        value, unit = match.groups()
-        value = float(value)
-        
-        # Convert to hours
-        if unit == 's':  # seconds
-            return max(1, int(value / 3600))  # Minimum 1 hour
-        elif unit == 'm':  # minutes
-            return max(1, int(value / 60))    # Minimum 1 hour
-        elif unit == 'h':  # hours
-            return max(1, int(value))         # Minimum 1 hour
-        elif unit == 'd':  # days
-            return int(value * 24)
-        
-        raise ValueError(f"Invalid time unit: '{unit}'. Use s, m, h, or d")
-
-    forum = app_commands.Group(name="forum", description="Configure ForumGuard moderation settings.", default_permissions=discord.Permissions(manage_guild=True))
-
-    # Nested command groups
-    channel_group = app_commands.Group(name="channel", description="Manage monitored forum channels.", parent=forum)
-    role_group = app_commands.Group(name="role", description="Manage support roles.", parent=forum)
-    settings_group = app_commands.Group(name="settings", description="Manage bot settings.", parent=forum)
-    tags_group = app_commands.Group(name="tags", description="Manage solution tags for forums.", parent=forum)
-    solutions_group = app_commands.Group(name="solutions", description="Manage thread solutions.", parent=forum)
-    escalation_group = app_commands.Group(name="escalation", description="Manage thread escalation settings.", parent=forum)
-
-    @forum.command(name="help", description="Shows a list of all available commands.")
-    async def help_command(self, interaction: discord.Interaction):
+    @staticmethod
+    def _build_help_embed() -> discord.Embed:
+        """Build the static /forum help embed."""
         embed = discord.Embed(
             title="ForumGuard Commands",
             description="Here is a list of available commands to configure the bot. You must have `Manage Server` permissions to use them.",
@@ -74,9 +69,126 @@ class SettingsCog(commands.Cog):
         embed.add_field(name="`/forum help`", value="Shows this help message.", inline=False)
 
         embed.set_footer(text="Developed by Dr. Skinner • ForumGuard | A specialized bot for moderating forum channel replies.\n💡 Context Menus: Right-click messages to mark as Solution/Helpful or Unmark")
+        return embed
 
+    def _get_cached_choices(self, key: tuple) -> Optional[list]:
+        """Return recently built autocomplete entries, if any."""
+        cached = self._ac_cache.get(key)
+        if cached:
+            if time.monotonic() - cached[0] < AUTOCOMPLETE_CACHE_SECONDS:
+                return cached[1]
+            del self._ac_cache[key]
+        return None
+
+    def _set_cached_choices(self, key: tuple, choices: list) -> list:
+        """Store a freshly built autocomplete choice list, paired with lowercased names for filtering."""
+        entries = [(choice.name.lower(), choice) for choice in choices]
+        now = time.monotonic()
+        # Entries are kept in build order, so expired ones sit at the front
+        while self._ac_cache:
+            oldest_key = next(iter(self._ac_cache))
+            if (now - self._ac_cache[oldest_key][0] < AUTOCOMPLETE_CACHE_SECONDS
+                    and len(self._ac_cache) < AUTOCOMPLETE_CACHE_MAX_ENTRIES):
+                break
+            del self._ac_cache[oldest_key]
+        self._ac_cache.pop(key, None)
+        self._ac_cache[key] = (now, entries)
+        return entries
+
+    def _clear_autocomplete_cache(self, guild_id: int):
+        """Drop all cached autocomplete choices for a guild after its settings change."""
+        for key in [key for key in self._ac_cache if key[0] == guild_id]:
+            del self._ac_cache[key]
+
+    def _update_cached_ids(self, guild_id: int, key: str, item_id: int, added: bool):
+        """Patch a cached ID set ('monitored_channels' or 'support_roles') and drop the guild's autocomplete choices."""
+        def updater(config: dict):
+            config[key] = config[key] | {item_id} if added else config[key] - {item_id}
+        config_cache.patch(guild_id, updater)
+        self._clear_autocomplete_cache(guild_id)
+        
+        # Keep the bot-wide set of monitored forums in sync as well
+        if key == 'monitored_channels':
+            if added:
+                self.bot.monitored_parents.add(item_id)
+            else:
+                self.bot.monitored_parents.discard(item_id)
+
+    async def _mutate_and_reply(self, interaction: discord.Interaction, operation: Awaitable[bool],
+                                key: str, item_id: int, added: bool, success: tuple, failure: tuple):
+        """Run a channel/role write, update caches if it changed anything, and reply with a (title, message) embed."""
+        if await operation:
+            self._update_cached_ids(interaction.guild_id, key, item_id, added)
+            embed = embed_factory.success_embed(*success)
+        else:
+            embed = embed_factory.error_embed(*failure)
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
+    def _tag_indexes(self, forum: discord.ForumChannel) -> tuple:
+        """Return a forum's tags indexed by ID and by lowercased name, rebuilt only when its tags change."""
+        tags = forum.available_tags
+        signature = tuple((tag.id, tag.name) for tag in tags)
+        cached = self._tag_index_cache.get(forum.id)
+        if cached and cached[0] == signature:
+            return cached[1], cached[2]
+        
+        by_id = {tag.id: tag for tag in tags}
+        by_name = {tag.name.lower(): tag for tag in tags}
+        self._tag_index_cache[forum.id] = (signature, by_id, by_name)
+        return by_id, by_name
+
+    @staticmethod
+    def _channel_mentions(guild: discord.Guild, channel_ids) -> list:
+        """Returns mentions, in ID order, for the given channel IDs that still exist in the guild."""
+        get_channel = guild.get_channel
+        return [channel.mention for channel_id in sorted(channel_ids) if (channel := get_channel(channel_id))]
+
+    @staticmethod
+    def _filter_choices(entries: list, current: str) -> list:
+        """Filter cached entries by the current input, falling back to all choices, limited to 25 (Discord limit)."""
+        # Show all choices if current input is empty or very short (0-1 chars)
+        if len(current) > 1:
+            current_lc = current.lower()
+            matches = list(itertools.islice((choice for name_lc, choice in entries if current_lc in name_lc), 25))
+            if matches:
+                return matches
+        # If no matches found, show all choices anyway
+        return [choice for _, choice in entries[:25]]
+
+    def parse_time_to_hours(self, time_str: str) -> int:
+        """Parse time string like '1h', '30m', '2d', '1 week' to hours."""
+        match = _TIME_RE.match(time_str)
+        if not match:
+            raise ValueError(f"Invalid time format: '{time_str.strip()}'. Use formats like '1h', '30m', '2d'")
+        
+        value, unit = match.groups()
+        value = float(value)
+        
+        if unit is None:
+            # If no unit provided, assume hours
+            return int(value)
+        
+        # Convert to hours
+        unit = unit[0].lower()
+        hours = value * _UNIT_SECONDS[unit] / 3600
+        if unit in ('d', 'w'):  # days and weeks
+            return int(hours)
+        return max(1, int(hours))  # Minimum 1 hour
+
+    forum = app_commands.Group(name="forum", description="Configure ForumGuard moderation settings.", default_permissions=discord.Permissions(manage_guild=True))
+
+    # Nested command groups
+    channel_group = app_commands.Group(name="channel", description="Manage monitored forum channels.", parent=forum)
+    role_group = app_commands.Group(name="role", description="Manage support roles.", parent=forum)
+    settings_group = app_commands.Group(name="settings", description="Manage bot settings.", parent=forum)
+    tags_group = app_commands.Group(name="tags", description="Manage solution tags for forums.", parent=forum)
+    solutions_group = app_commands.Group(name="solutions", description="Manage thread solutions.", parent=forum)
+    escalation_group = app_commands.Group(name="escalation", description="Manage thread escalation settings.", parent=forum)
+
+    @forum.command(name="help", description="Shows a list of all available commands.")
+    async def help_command(self, interaction: discord.Interaction):
+        await interaction.response.send_message(embed=self._help_embed, ephemeral=True)
+
     async def monitored_channel_autocomplete(
         self,
         interaction: discord.Interaction,
@@ -85,30 +197,26 @@ class SettingsCog(commands.Cog):
         """Autocomplete function for currently monitored forum channels."""
         try:
             # Get guild configuration
-            config = await db.get_guild_config(interaction.guild_id)
+            config = await config_cache.get_config(interaction.guild_id)
             
             if not config or not config.get('monitored_channels'):
                 return [app_commands.Choice(name="No monitored channels configured", value="no_channels")]
             
-            # Get monitored forum channels and filter by current input
-            choices = []
-            for channel_id in config['monitored_channels']:
-                channel = interaction.guild.get_channel(channel_id)
-                if channel and isinstance(channel, discord.ForumChannel):
-                    # Show all channels if current input is empty or very short (0-1 chars)
-                    # Otherwise filter by channels that contain the current input
-                    if len(current) <= 1 or current.lower() in channel.name.lower():
-                        choices.append(app_commands.Choice(name=channel.name, value=str(channel.id)))
-            
-            # If no matches found, show all monitored channels anyway
-            if not choices and len(current) > 1:
-                for channel_id in config['monitored_channels']:
+            # Get monitored forum channels, reusing the list built for the previous keystroke
+            cache_key = (interaction.guild_id, 'channels')
+            entries = self._get_cached_choices(cache_key)
+            if entries is None:
+                choices = []
+                for channel_id in sorted(config['monitored_channels']):
                     channel = interaction.guild.get_channel(channel_id)
-                    if channel and isinstance(channel, discord.ForumChannel):
+                    if channel is None:
+                        # Deleted forums stay listed so they can still be removed
+                        choices.append(app_commands.Choice(name=f"Deleted channel ({channel_id})", value=str(channel_id)))
+                    elif isinstance(channel, discord.ForumChannel):
                         choices.append(app_commands.Choice(name=channel.name, value=str(channel.id)))
+                entries = self._set_cached_choices(cache_key, choices)
             
-            # Limit to 25 choices (Discord limit)
-            return choices[:25]
+            return self._filter_choices(entries, current)
             
         except Exception as e:
             return [app_commands.Choice(name=f"Error: {str(e)}", value="error")]
@@ -121,30 +229,23 @@ class SettingsCog(commands.Cog):
         """Autocomplete function for currently configured support roles."""
         try:
             # Get guild configuration
-            config = await db.get_guild_config(interaction.guild_id)
+            config = await config_cache.get_config(interaction.guild_id)
             
             if not config or not config.get('support_roles'):
                 return [app_commands.Choice(name="No support roles configured", value="no_roles")]
             
-            # Get support roles and filter by current input
-            choices = []
-            for role_id in config['support_roles']:
-                role = interaction.guild.get_role(role_id)
-                if role:
-                    # Show all roles if current input is empty or very short (0-1 chars)
-                    # Otherwise filter by roles that contain the current input
-                    if len(current) <= 1 or current.lower() in role.name.lower():
-                        choices.append(app_commands.Choice(name=role.name, value=str(role.id)))
-            
-            # If no matches found, show all configured roles anyway
-            if not choices and len(current) > 1:
-                for role_id in config['support_roles']:
+            # Get support roles, reusing the list built for the previous keystroke
+            cache_key = (interaction.guild_id, 'roles')
+            entries = self._get_cached_choices(cache_key)
+            if entries is None:
+                choices = []
+                for role_id in sorted(config['support_roles']):
                     role = interaction.guild.get_role(role_id)
                     if role:
                         choices.append(app_commands.Choice(name=role.name, value=str(role.id)))
+                entries = self._set_cached_choices(cache_key, choices)
             
-            # Limit to 25 choices (Discord limit)
-            return choices[:25]
+            return self._filter_choices(entries, current)
             
         except Exception as e:
             return [app_commands.Choice(name=f"Error: {str(e)}", value="error")]
@@ -153,99 +254,79 @@ class SettingsCog(commands.Cog):
     @app_commands.describe(channel="The forum channel to add.")
     @app_commands.checks.has_permissions(manage_guild=True)
     async def add_channel(self, interaction: discord.Interaction, channel: ForumChannel):
-        success = await db.add_monitored_channel(interaction.guild_id, channel.id)
-        if success:
-            # Invalidate the cache for this guild
-            moderation_cog = self.bot.get_cog('ModerationCog')
-            if moderation_cog:
-                moderation_cog.clear_guild_cache(interaction.guild.id)
-            embed = embed_factory.success_embed("Channel Added", f"Successfully added {channel.mention} to the list of monitored channels.")
-        else:
-            embed = embed_factory.error_embed("Already Added", f"{channel.mention} is already being monitored.")
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await self._mutate_and_reply(
+            interaction, db.add_monitored_channel(interaction.guild_id, channel.id),
+            'monitored_channels', channel.id, True,
+            ("Channel Added", f"Successfully added {channel.mention} to the list of monitored channels."),
+            ("Already Added", f"{channel.mention} is already being monitored."))
 
     @channel_group.command(name="remove", description="Stop moderating a forum channel.")
     @app_commands.describe(channel="The forum channel to remove.")
     @app_commands.autocomplete(channel=monitored_channel_autocomplete)
     @app_commands.checks.has_permissions(manage_guild=True)
     async def remove_channel(self, interaction: discord.Interaction, channel: str):
-        # Convert channel ID to channel object
-        try:
-            channel_id = int(channel)
-            channel_obj = interaction.guild.get_channel(channel_id)
-            if not channel_obj or not isinstance(channel_obj, discord.ForumChannel):
-                embed = embed_factory.error_embed("Invalid Channel", "Selected channel is not a valid forum channel.")
-                await interaction.response.send_message(embed=embed, ephemeral=True)
-                return
-        except ValueError:
+        # Autocomplete values are channel IDs; placeholder choices and typed text are not numeric
+        if not channel.isdecimal():
             embed = embed_factory.error_embed("Invalid Selection", "Please select a valid channel from the autocomplete.")
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
-        success = await db.remove_monitored_channel(interaction.guild_id, channel_obj.id)
-        if success:
-            # Invalidate the cache for this guild
-            moderation_cog = self.bot.get_cog('ModerationCog')
-            if moderation_cog:
-                moderation_cog.clear_guild_cache(interaction.guild.id)
-            embed = embed_factory.success_embed("Channel Removed", f"Successfully removed {channel_obj.mention} from the list.")
-        else:
-            embed = embed_factory.error_embed("Not Found", f"{channel_obj.mention} was not on the list of monitored channels.")
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        # Convert channel ID to channel object; a deleted forum can still be removed by its ID
+        channel_id = int(channel)
+        channel_obj = interaction.guild.get_channel(channel_id)
+        if channel_obj is not None and not isinstance(channel_obj, discord.ForumChannel):
+            embed = embed_factory.error_embed("Invalid Channel", "Selected channel is not a valid forum channel.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        channel_name = channel_obj.mention if channel_obj else f"Deleted channel (ID: {channel_id})"
+        await self._mutate_and_reply(
+            interaction, db.remove_monitored_channel(interaction.guild_id, channel_id),
+            'monitored_channels', channel_id, False,
+            ("Channel Removed", f"Successfully removed {channel_name} from the list."),
+            ("Not Found", f"{channel_name} was not on the list of monitored channels."))
 
     @role_group.command(name="add", description="Add a role that can reply to any monitored thread.")
     @app_commands.describe(role="The support role to add.")
     @app_commands.checks.has_permissions(manage_guild=True)
     async def add_role(self, interaction: discord.Interaction, role: Role):
-        success = await db.add_support_role(interaction.guild_id, role.id)
-        if success:
-            # Invalidate the cache for this guild
-            moderation_cog = self.bot.get_cog('ModerationCog')
-            if moderation_cog:
-                moderation_cog.clear_guild_cache(interaction.guild.id)
-            embed = embed_factory.success_embed("Role Added", f"Successfully added {role.mention} as a support role.")
-        else:
-            embed = embed_factory.error_embed("Already Added", f"{role.mention} is already a support role.")
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        await self._mutate_and_reply(
+            interaction, db.add_support_role(interaction.guild_id, role.id),
+            'support_roles', role.id, True,
+            ("Role Added", f"Successfully added {role.mention} as a support role."),
+            ("Already Added", f"{role.mention} is already a support role."))
 
     @role_group.command(name="remove", description="Remove a support role.")
     @app_commands.describe(role="The support role to remove.")
     @app_commands.autocomplete(role=configured_role_autocomplete)
     @app_commands.checks.has_permissions(manage_guild=True)
     async def remove_role(self, interaction: discord.Interaction, role: str):
-        # Convert role ID to role object
-        try:
-            role_id = int(role)
-            role_obj = interaction.guild.get_role(role_id)
-            if not role_obj:
-                embed = embed_factory.error_embed("Invalid Role", "Selected role is not valid or was deleted.")
-                await interaction.response.send_message(embed=embed, ephemeral=True)
-                return
-        except ValueError:
+        # Autocomplete values are role IDs; placeholder choices and typed text are not numeric
+        if not role.isdecimal():
             embed = embed_factory.error_embed("Invalid Selection", "Please select a valid role from the autocomplete.")
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
-        success = await db.remove_support_role(interaction.guild_id, role_obj.id)
-        if success:
-            # Invalidate the cache for this guild
-            moderation_cog = self.bot.get_cog('ModerationCog')
-            if moderation_cog:
-                moderation_cog.clear_guild_cache(interaction.guild.id)
-            embed = embed_factory.success_embed("Role Removed", f"Successfully removed {role_obj.mention} from support roles.")
-        else:
-            embed = embed_factory.error_embed("Not Found", f"{role_obj.mention} was not a support role.")
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+        # Convert role ID to role object
+        role_obj = interaction.guild.get_role(int(role))
+        if not role_obj:
+            embed = embed_factory.error_embed("Invalid Role", "Selected role is not valid or was deleted.")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        await self._mutate_and_reply(
+            interaction, db.remove_support_role(interaction.guild_id, role_obj.id),
+            'support_roles', role_obj.id, False,
+            ("Role Removed", f"Successfully removed {role_obj.mention} from support roles."),
+            ("Not Found", f"{role_obj.mention} was not a support role."))
 
     @settings_group.command(name="dms", description="Enable or disable DM notifications for users whose messages are deleted.")
     @app_commands.describe(enabled="Set to True to enable DMs, False to disable.")
     @app_commands.checks.has_permissions(manage_guild=True)
     async def settings_dms(self, interaction: discord.Interaction, enabled: bool):
         await db.set_dm_notifications(interaction.guild_id, enabled)
-        # Invalidate the cache for this guild
-        moderation_cog = self.bot.get_cog('ModerationCog')
-        if moderation_cog:
-            moderation_cog.clear_guild_cache(interaction.guild.id)
+        # Patch the cached config for this guild
+        config_cache.patch(interaction.guild.id, lambda config: config.update(dm_notifications_enabled=enabled))
         status = "enabled" if enabled else "disabled"
         embed = embed_factory.success_embed("Settings Updated", f"DM notifications have been {status}.")
         await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -253,10 +334,11 @@ class SettingsCog(commands.Cog):
     @settings_group.command(name="view", description="Display the current configuration for ForumGuard.")
     @app_commands.checks.has_permissions(manage_guild=True)
     async def view_settings(self, interaction: discord.Interaction):
-        config = await db.get_guild_config(interaction.guild_id)
+        config = await config_cache.get_config(interaction.guild_id)
         if not config:
             await db.add_guild_if_not_exists(interaction.guild_id)
-            config = await db.get_guild_config(interaction.guild_id)
+            config_cache.invalidate(interaction.guild_id)
+            config = await config_cache.get_config(interaction.guild_id)
         
         embed = embed_factory.view_settings_embed(interaction.guild, config)
         await interaction.response.send_message(embed=embed, ephemeral=True)
@@ -288,14 +370,6 @@ class SettingsCog(commands.Cog):
                     except (ValueError, TypeError):
                         pass
             
-            # If not available from namespace, try the old method as fallback
-            if not forum_param:
-                for option in interaction.data.get("options", []):
-                    if option["name"] == "forum":
-                        forum_id = int(option["value"])
-                        forum_param = interaction.guild.get_channel(forum_id)
-                        break
-            
             if not forum_param:
                 return [app_commands.Choice(name="Please select a forum channel first", value="no_forum")]
             
@@ -303,24 +377,18 @@ class SettingsCog(commands.Cog):
                 return [app_commands.Choice(name=f"Not a forum channel: {type(forum_param).__name__}", value="not_forum")]
             
             # Check if forum has any tags
-            if not forum_param.available_tags:
+            tags = forum_param.available_tags
+            if not tags:
                 return [app_commands.Choice(name="This forum has no tags configured", value="no_tags")]
             
-            # Get available tags and filter by current input
-            choices = []
-            for tag in forum_param.available_tags:
-                # Show all tags if current input is empty or very short (0-1 chars)
-                # Otherwise filter by tags that contain the current input
-                if len(current) <= 1 or current.lower() in tag.name.lower():
-                    choices.append(app_commands.Choice(name=tag.name, value=tag.name))
+            # Get available tags, reusing the list built for the previous keystroke
+            cache_key = (interaction.guild_id, 'tags', forum_param.id)
+            entries = self._get_cached_choices(cache_key)
+            if entries is None:
+                choices = [app_commands.Choice(name=tag.name, value=tag.name) for tag in tags]
+                entries = self._set_cached_choices(cache_key, choices)
             
-            # If no matches found, show all tags anyway
-            if not choices and len(current) > 1:
-                for tag in forum_param.available_tags:
-                    choices.append(app_commands.Choice(name=tag.name, value=tag.name))
-            
-            # Limit to 25 choices (Discord limit)
-            return choices[:25]
+            return self._filter_choices(entries, current)
             
         except Exception as e:
             # Log the error for debugging but don't crash
@@ -353,47 +421,31 @@ class SettingsCog(commands.Cog):
                     except (ValueError, TypeError):
                         pass
             
-            # If not available from namespace, try the old method as fallback
-            if not forum_param:
-                for option in interaction.data.get("options", []):
-                    if option["name"] == "forum":
-                        forum_id = int(option["value"])
-                        forum_param = interaction.guild.get_channel(forum_id)
-                        break
-            
             if not forum_param:
                 return [app_commands.Choice(name="Please select a forum channel first", value="no_forum")]
             
             if not isinstance(forum_param, discord.ForumChannel):
                 return [app_commands.Choice(name=f"Not a forum channel: {type(forum_param).__name__}", value="not_forum")]
             
-            # Get configured solution tags for this forum
-            configured_tag_ids = await db.get_forum_solution_tags(interaction.guild_id, forum_param.id)
-            
-            if not configured_tag_ids:
-                return [app_commands.Choice(name="No solution tags configured for this forum", value="no_tags")]
-            
-            # Get the actual tag objects and filter by current input
-            choices = []
-            available_tags = {tag.id: tag for tag in forum_param.available_tags}
-            
-            for tag_id in configured_tag_ids:
-                if tag_id in available_tags:
-                    tag = available_tags[tag_id]
-                    # Show all tags if current input is empty or very short (0-1 chars)
-                    # Otherwise filter by tags that contain the current input
-                    if len(current) <= 1 or current.lower() in tag.name.lower():
-                        choices.append(app_commands.Choice(name=tag.name, value=tag.name))
-            
-            # If no matches found, show all configured tags anyway
-            if not choices and len(current) > 1:
+            # Get configured solution tags, reusing the list built for the previous keystroke
+            cache_key = (interaction.guild_id, 'configured_tags', forum_param.id)
+            entries = self._get_cached_choices(cache_key)
+            if entries is None:
+                configured_tag_ids = await db.get_forum_solution_tags(interaction.guild_id, forum_param.id)
+                
+                # Get the actual tag objects
+                choices = []
+                available_tags, _ = self._tag_indexes(forum_param)
                 for tag_id in configured_tag_ids:
                     if tag_id in available_tags:
                         tag = available_tags[tag_id]
                         choices.append(app_commands.Choice(name=tag.name, value=tag.name))
+                entries = self._set_cached_choices(cache_key, choices)
+            
+            if not entries:
+                return [app_commands.Choice(name="No solution tags configured for this forum", value="no_tags")]
             
-            # Limit to 25 choices (Discord limit)
-            return choices[:25]
+            return self._filter_choices(entries, current)
             
         except Exception as e:
             # Log the error for debugging but don't crash
@@ -405,19 +457,21 @@ class SettingsCog(commands.Cog):
     @app_commands.checks.has_permissions(manage_guild=True)
     async def add_solution_tag(self, interaction: discord.Interaction, forum: ForumChannel, tag: str):
         # Get available tags from the forum
-        available_tags = {t.name.lower(): t for t in forum.available_tags}
+        _, available_tags = self._tag_indexes(forum)
+        tag_obj = available_tags.get(tag.lower())
         
-        if tag.lower() not in available_tags:
+        if tag_obj is None:
+            tag_list = ', '.join(f'`{t.name}`' for t in forum.available_tags) or 'None'
             embed = embed_factory.error_embed("Tag Not Found", 
                 f"The tag `{tag}` doesn't exist in {forum.mention}.\n"
-                f"Available tags: {', '.join([f'`{t.name}`' for t in forum.available_tags]) if forum.available_tags else 'None'}")
+                f"Available tags: {tag_list}")
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
-        tag_obj = available_tags[tag.lower()]
         success = await db.add_solution_tag(interaction.guild_id, forum.id, tag_obj.id, tag_obj.name)
         
         if success:
+            self._clear_autocomplete_cache(interaction.guild_id)
             embed = embed_factory.success_embed("Solution Tag Added", 
                 f"The tag `{tag_obj.name}` in {forum.mention} will now mark threads as solved.")
         else:
@@ -432,18 +486,19 @@ class SettingsCog(commands.Cog):
     @app_commands.checks.has_permissions(manage_guild=True)
     async def remove_solution_tag(self, interaction: discord.Interaction, forum: ForumChannel, tag: str):
         # Get available tags from the forum
-        available_tags = {t.name.lower(): t for t in forum.available_tags}
+        _, available_tags = self._tag_indexes(forum)
+        tag_obj = available_tags.get(tag.lower())
         
-        if tag.lower() not in available_tags:
+        if tag_obj is None:
             embed = embed_factory.error_embed("Tag Not Found", 
                 f"The tag `{tag}` doesn't exist in {forum.mention}.")
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
         
-        tag_obj = available_tags[tag.lower()]
         success = await db.remove_solution_tag(interaction.guild_id, forum.id, tag_obj.id)
         
         if success:
+            self._clear_autocomplete_cache(interaction.guild_id)
             embed = embed_factory.success_embed("Solution Tag Removed", 
                 f"The tag `{tag_obj.name}` in {forum.mention} will no longer mark threads as solved.")
         else:
@@ -500,14 +555,19 @@ class SettingsCog(commands.Cog):
             color=embed_factory.INFO_COLOR
         )
 
-        for solution in solutions:
+        # Fetch all solution messages concurrently rather than one round-trip at a time
+        messages = await asyncio.gather(*(thread.fetch_message(solution['message_id']) for solution in solutions),
+                                        return_exceptions=True)
+
+        for solution, message in zip(solutions, messages):
             try:
-                message = await thread.fetch_message(solution['message_id'])
+                if isinstance(message, Exception):
+                    raise message
                 marked_by = interaction.guild.get_member(solution['marked_by'])
                 marked_by_name = marked_by.display_name if marked_by else f"Unknown User (ID: {solution['marked_by']})"
                 
                 category_emoji = "✅" if solution['category'] == 'solution' else "💡"
-                message_preview = message.content[:100] + "..." if len(message.content) > 100 else message.content
+                message_preview = embed_factory.preview(message.content)
                 
                 embed.add_field(
                     name=f"{category_emoji} {solution['category'].title()}",
@@ -552,12 +612,7 @@ class SettingsCog(commands.Cog):
                               behavior: app_commands.Choice[str] = None, delay_hours: str = "12h"):
         
         # Set default behavior if not provided
-        if behavior is None:
-            behavior_value = "support_only"
-            behavior_name = "Support Only"
-        else:
-            behavior_value = behavior.value
-            behavior_name = behavior.name.split(" - ")[0]
+        behavior_value = behavior.value if behavior is not None else "support_only"
         
         # Parse time strings to hours
         try:
@@ -593,7 +648,7 @@ class SettingsCog(commands.Cog):
             return
         
         # Check if guild has any monitored forums
-        config = await db.get_guild_config(interaction.guild_id)
+        config = await config_cache.get_config(interaction.guild_id)
         if not config or not config.get('monitored_channels'):
             embed = embed_factory.error_embed("No Monitored Forums", 
                 "No forums are being monitored by ForumGuard. Add some first with `/forum channel add`.")
@@ -606,20 +661,17 @@ class SettingsCog(commands.Cog):
             tier2_hours, tier2_role.id, escalation_channel.id, True,
             behavior_value, community_delay_hours
         )
+        # Escalation settings are cached alongside the guild config
+        config_cache.invalidate(interaction.guild_id)
         
-        # Create behavior description
-        behavior_descriptions = {
-            "support_only": "Only support team responses prevent escalation",
-            "community_friendly": "Any community response prevents escalation", 
-            "hybrid": f"Community responses delay escalation by {delay_hours} ({community_delay_hours}h), support responses prevent it"
-        }
+        # Create behavior description; only the hybrid one needs formatting
+        behavior_description = (
+            _BEHAVIOR_DESCRIPTIONS.get(behavior_value)
+            or f"Community responses delay escalation by {delay_hours} ({community_delay_hours}h), support responses prevent it"
+        )
         
         # Get list of monitored forums for display
-        monitored_forum_names = []
-        for forum_id in config['monitored_channels']:
-            forum = interaction.guild.get_channel(forum_id)
-            if forum:
-                monitored_forum_names.append(forum.mention)
+        monitored_forum_names = self._channel_mentions(interaction.guild, config['monitored_channels'])
         
         # Build success message
         success_message = (
@@ -627,7 +679,7 @@ class SettingsCog(commands.Cog):
             f"{', '.join(monitored_forum_names)}\n\n"
             f"**Tier 1:** After {tier1_time} ({tier1_hours}h) → Ping {tier1_role.mention} in thread\n"
             f"**Tier 2:** After {tier2_time} ({tier2_hours}h) → Ping {tier2_role.mention} in {escalation_channel.mention}\n"
-            f"**Behavior:** {behavior_descriptions[behavior_value]}"
+            f"**Behavior:** {behavior_description}"
         )
         
         # Add note if delay_hours was provided but ignored
@@ -641,7 +693,7 @@ class SettingsCog(commands.Cog):
     @escalation_group.command(name="view", description="View escalation settings for the server.")
     @app_commands.checks.has_permissions(manage_guild=True)
     async def view_escalation(self, interaction: discord.Interaction):
-        settings = await db.get_guild_escalation_settings(interaction.guild_id)
+        settings = await config_cache.get_escalation_settings(interaction.guild_id)
         
         if not settings:
             embed = embed_factory.info_embed("No Escalation Settings", 
@@ -650,13 +702,10 @@ class SettingsCog(commands.Cog):
             return
         
         # Get monitored forums for display
-        config = await db.get_guild_config(interaction.guild_id)
+        config = await config_cache.get_config(interaction.guild_id)
         monitored_forums = []
         if config and config.get('monitored_channels'):
-            for forum_id in config['monitored_channels']:
-                forum = interaction.guild.get_channel(forum_id)
-                if forum:
-                    monitored_forums.append(forum.mention)
+            monitored_forums = self._channel_mentions(interaction.guild, config['monitored_channels'])
         
         embed = discord.Embed(
             title="Thread Escalation Settings",
@@ -675,11 +724,9 @@ class SettingsCog(commands.Cog):
         status = "✅ Enabled" if settings['enabled'] else "❌ Disabled"
         behavior = settings.get('escalation_behavior', 'support_only')
         
-        behavior_text = {
-            'support_only': '🎯 Support Only',
-            'community_friendly': '🤝 Community Friendly', 
-            'hybrid': f"⚖️ Hybrid (delay: {settings.get('community_delay_hours', 12)}h)"
-        }.get(behavior, behavior)
+        behavior_text = _BEHAVIOR_LABELS.get(behavior)
+        if behavior_text is None:
+            behavior_text = f"⚖️ Hybrid (delay: {settings.get('community_delay_hours', 12)}h)" if behavior == 'hybrid' else behavior
         
         escalation_info = (
             f"**Status:** {status}\n"
@@ -712,7 +759,8 @@ class SettingsCog(commands.Cog):
                 return
             
             # Perform global reset
-            reset_count = await db.reset_all_escalation_states(interaction.guild_id)
+            thread_ids = [thread.id for thread in interaction.guild.threads]
+            reset_count = await db.reset_all_escalation_states(interaction.guild_id, thread_ids)
             
             if reset_count == 0:
                 embed = embed_factory.info_embed("No Escalations to Reset", 
@@ -1,16 +1,25 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
+import asyncio
 import logging
+import time
+from typing import Optional
 
+from utils import config_cache
 from utils import database_handler as db
 from utils import embed_factory
 
+# How long a thread that hit the pin limit is assumed to still be full
+PINS_FULL_RECHECK_SECONDS = 300
+
 class SolutionsCog(commands.Cog):
     """Handles solution marking and pinning functionality."""
     
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        # thread_id -> time the thread was found at the pin limit
+        self._pins_full = {}
         
         # Add context menus to the bot
         self.ctx_menu_solution = app_commands.ContextMenu(
@@ -36,23 +45,24 @@ class SolutionsCog(commands.Cog):
         self.bot.tree.remove_command(self.ctx_menu_helpful.name, type=discord.AppCommandType.message)
         self.bot.tree.remove_command(self.ctx_menu_unmark.name, type=discord.AppCommandType.message)
 
-    async def can_mark_solutions(self, user: discord.Member, guild_id: int) -> bool:
+    async def can_mark_solutions(self, user: discord.Member, guild_id: int, config: Optional[dict] = None) -> bool:
         """Check if user has permission to mark solutions (must have support role)."""
-        config = await db.get_guild_config(guild_id)
+        if config is None:
+            config = await config_cache.get_config(guild_id)
         if not config or not config.get('support_roles'):
             return False
         
-        user_role_ids = {role.id for role in user.roles}
-        support_role_ids = set(config['support_roles'])
-        
-        return not support_role_ids.isdisjoint(user_role_ids)
+        # support_roles is cached as a frozenset, so this stops at the first matching role
+        support_role_ids = config['support_roles']
+        return any(role.id in support_role_ids for role in user.roles)
 
-    async def is_monitored_thread(self, thread: discord.Thread) -> bool:
+    async def is_monitored_thread(self, thread: discord.Thread, config: Optional[dict] = None) -> bool:
         """Check if the thread is in a monitored forum."""
         if not isinstance(thread, discord.Thread) or not thread.parent:
             return False
         
-        config = await db.get_guild_config(thread.guild.id)
+        if config is None:
+            config = await config_cache.get_config(thread.guild.id)
         if not config or not config.get('monitored_channels'):
             return False
         
@@ -60,12 +70,20 @@ class SolutionsCog(commands.Cog):
 
     async def pin_solution_message(self, message: discord.Message) -> bool:
         """Pin a message and handle potential errors."""
+        # Skip the request entirely if the thread recently rejected a pin for being full
+        full_since = self._pins_full.get(message.channel.id)
+        if full_since is not None:
+            if time.monotonic() - full_since < PINS_FULL_RECHECK_SECONDS:
+                return False
+            del self._pins_full[message.channel.id]
+
         try:
             await message.pin(reason="Marked as solution by support team")
             return True
         except discord.HTTPException as e:
             if e.code == 30003:  # Too many pinned messages
                 logging.warning(f"Cannot pin message {message.id} - too many pinned messages in channel")
+                self._mark_pins_full(message.channel.id)
                 return False
             else:
                 logging.error(f"Failed to pin message {message.id}: {e}")
@@ -74,10 +92,29 @@ class SolutionsCog(commands.Cog):
             logging.error(f"Cannot pin message {message.id} - missing permissions")
             return False
 
+    def _mark_pins_full(self, thread_id: int):
+        """Remember that a thread is at the pin limit, dropping entries that are past their recheck time."""
+        now = time.monotonic()
+        # Entries are kept in insertion order, so the expired ones sit at the front
+        while self._pins_full:
+            oldest_id = next(iter(self._pins_full))
+            if now - self._pins_full[oldest_id] < PINS_FULL_RECHECK_SECONDS:
+                break
+            del self._pins_full[oldest_id]
+        self._pins_full.pop(thread_id, None)
+        self._pins_full[thread_id] = now
+
+    @commands.Cog.listener()
+    async def on_raw_thread_delete(self, payload: discord.RawThreadDeleteEvent):
+        """Forget the pin-limit state of deleted threads."""
+        self._pins_full.pop(payload.thread_id, None)
+
     async def unpin_solution_message(self, message: discord.Message) -> bool:
         """Unpin a message and handle potential errors."""
         try:
             await message.unpin(reason="Solution unmarked by support team")
+            # The thread has a free pin slot again
+            self._pins_full.pop(message.channel.id, None)
             return True
         except discord.HTTPException:
             logging.error(f"Failed to unpin message {message.id}")
@@ -96,6 +133,19 @@ class SolutionsCog(commands.Cog):
         except Exception as e:
             logging.error(f"Error sending closure suggestion in thread {thread.id}: {e}")
 
+    async def notify_thread(self, thread: discord.Thread, message: discord.Message, user: discord.Member, category: str):
+        """Announce the marked message in the thread and, for full solutions, suggest closing it."""
+        # Send notification to thread about the solution
+        try:
+            notification_embed = embed_factory.solution_marked_embed(message, user, category)
+            await thread.send(embed=notification_embed)
+        except discord.Forbidden:
+            pass  # Ignore if we can't send to thread
+        
+        # Suggest thread closure if this is a full solution (not just helpful)
+        if category == "solution":
+            await self.suggest_thread_closure(thread, message)
+
     async def mark_as_solution(self, interaction: discord.Interaction, message: discord.Message):
         """Mark a message as the solution to the thread."""
         await self._mark_solution(interaction, message, "solution", "Solution")
@@ -106,121 +156,105 @@ class SolutionsCog(commands.Cog):
 
     async def _mark_solution(self, interaction: discord.Interaction, message: discord.Message, category: str, display_name: str):
         """Internal method to handle solution marking."""
+        # Defer up front so slow lookups can't outlast the interaction token
+        await interaction.response.defer(ephemeral=True)
+        
+        # Both the permission and monitored-forum checks share one config lookup
+        config = await config_cache.get_config(interaction.guild_id)
+        
         # Check if user has permission
-        if not await self.can_mark_solutions(interaction.user, interaction.guild_id):
+        if not await self.can_mark_solutions(interaction.user, interaction.guild_id, config):
             embed = embed_factory.error_embed("Permission Denied", 
                 "Only support team members can mark solutions.")
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await interaction.followup.send(embed=embed, ephemeral=True)
             return
 
         # Check if message is in a monitored thread
         if not isinstance(message.channel, discord.Thread):
             embed = embed_factory.error_embed("Invalid Channel", 
                 "Solutions can only be marked in forum threads.")
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await interaction.followup.send(embed=embed, ephemeral=True)
             return
 
         thread = message.channel
-        if not await self.is_monitored_thread(thread):
+        if not await self.is_monitored_thread(thread, config):
             embed = embed_factory.error_embed("Not Monitored", 
                 "This forum channel is not being monitored by ForumGuard.")
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await interaction.followup.send(embed=embed, ephemeral=True)
             return
 
-        # Check if message is already marked as a solution
-        existing_solutions = await db.get_thread_solutions(thread.id)
-        if any(sol['message_id'] == message.id for sol in existing_solutions):
+        # Add to database, marking the thread as managed by the bot if this is a full solution;
+        # nothing is written if the message is already marked
+        managed_by = "context_menu" if category == "solution" else None
+        if not await db.add_thread_solution(thread.id, message.id, interaction.user.id, category, managed_by):
             embed = embed_factory.error_embed("Already Marked", 
                 "This message is already marked as a solution.")
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await interaction.followup.send(embed=embed, ephemeral=True)
             return
 
-        # Defer the response since we might take a while
-        await interaction.response.defer(ephemeral=True)
-
         # Pin the message
         pinned = await self.pin_solution_message(message)
         
-        # Add to database
-        await db.add_thread_solution(thread.id, message.id, interaction.user.id, category)
-        
-        # Mark thread as managed by the bot if this is a full solution
-        if category == "solution":
-            await db.add_managed_solution_thread(thread.id, "context_menu")
-        
         # Create success embed
         pin_status = "and pinned" if pinned else "(pinning failed - too many pins or missing permissions)"
         embed = embed_factory.success_embed(f"{display_name} Marked", 
             f"Message marked as {category} {pin_status}.\n\n"
-            f"**Message:** {message.content[:100]}{'...' if len(message.content) > 100 else ''}")
-        
-        await interaction.followup.send(embed=embed, ephemeral=True)
-        
-        # Send notification to thread about the solution
-        try:
-            notification_embed = embed_factory.solution_marked_embed(message, interaction.user, category)
-            await thread.send(embed=notification_embed)
-        except discord.Forbidden:
-            pass  # Ignore if we can't send to thread
+            f"**Message:** {embed_factory.preview(message.content)}")
         
-        # Suggest thread closure if this is a full solution (not just helpful)
-        if category == "solution":
-            await self.suggest_thread_closure(thread, message)
+        # The ephemeral reply and the thread notifications go out concurrently
+        await asyncio.gather(
+            interaction.followup.send(embed=embed, ephemeral=True),
+            self.notify_thread(thread, message, interaction.user, category)
+        )
         
         logging.info(f"Message {message.id} marked as {category} by {interaction.user} in thread {thread.id}")
 
     async def unmark_solution(self, interaction: discord.Interaction, message: discord.Message):
         """Remove solution marking from a message."""
+        # Defer up front so slow lookups can't outlast the interaction token
+        await interaction.response.defer(ephemeral=True)
+        
+        # Both the permission and monitored-forum checks share one config lookup
+        config = await config_cache.get_config(interaction.guild_id)
+        
         # Check if user has permission
-        if not await self.can_mark_solutions(interaction.user, interaction.guild_id):
+        if not await self.can_mark_solutions(interaction.user, interaction.guild_id, config):
             embed = embed_factory.error_embed("Permission Denied", 
                 "Only support team members can unmark solutions.")
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await interaction.followup.send(embed=embed, ephemeral=True)
             return
 
         # Check if message is in a monitored thread
         if not isinstance(message.channel, discord.Thread):
             embed = embed_factory.error_embed("Invalid Channel", 
                 "Solutions can only be unmarked in forum threads.")
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await interaction.followup.send(embed=embed, ephemeral=True)
             return
 
         thread = message.channel
-        if not await self.is_monitored_thread(thread):
+        if not await self.is_monitored_thread(thread, config):
             embed = embed_factory.error_embed("Not Monitored", 
                 "This forum channel is not being monitored by ForumGuard.")
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await interaction.followup.send(embed=embed, ephemeral=True)
             return
 
-        # Check if message is actually marked as a solution
-        existing_solutions = await db.get_thread_solutions(thread.id)
-        solution = next((sol for sol in existing_solutions if sol['message_id'] == message.id), None)
+        # Remove from database; this also tells us whether it was marked at all
+        category, remaining_solutions = await db.remove_thread_solution(thread.id, message.id)
         
-        if not solution:
+        if category is None:
             embed = embed_factory.error_embed("Not Marked", 
                 "This message is not marked as a solution.")
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await interaction.followup.send(embed=embed, ephemeral=True)
             return
 
-        # Defer the response since we might take a while
-        await interaction.response.defer(ephemeral=True)
-
         # Unpin the message
         await self.unpin_solution_message(message)
         
-        # Remove from database
-        await db.remove_thread_solution(thread.id, message.id)
-        
-        # If this was a full solution, check if there are any other solutions left
-        # If not, remove from managed threads
-        if solution['category'] == 'solution':
-            remaining_solutions = await db.get_thread_solutions(thread.id)
-            full_solutions = [sol for sol in remaining_solutions if sol['category'] == 'solution']
-            if not full_solutions:
-                await db.remove_managed_solution_thread(thread.id)
+        # If this was the last full solution, remove from managed threads
+        if category == 'solution' and not remaining_solutions:
+            await db.remove_managed_solution_thread(thread.id)
         
         # Create success embed
-        category = solution['category']
         embed = embed_factory.success_embed("Solution Unmarked", 
             f"Message no longer marked as {category} and unpinned.")
         
@@ -4,6 +4,8 @@ import discord
 from discord.ext import commands
 import logging
 import asyncio
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from dotenv import load_dotenv
 
 from utils import database_handler as db
@@ -22,16 +24,20 @@ log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(me
 console_handler = logging.StreamHandler()
 console_handler.setFormatter(log_formatter)
 
-# File Handler
+# File Handler (rotated so the log doesn't grow without bound)
 log_path = os.getenv('LOG_PATH', 'bot.log')
-file_handler = logging.FileHandler(log_path)
+file_handler = RotatingFileHandler(log_path, maxBytes=5 * 1024 * 1024, backupCount=5)
 file_handler.setFormatter(log_formatter)
 
+# Records are queued and written by a background thread, so logging never blocks the event loop
+log_queue = queue.SimpleQueue()
+log_listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+log_listener.start()
+
 # Get root logger
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
-logger.addHandler(console_handler)
-logger.addHandler(file_handler)
+logger.addHandler(QueueHandler(log_queue))
 
 # Silence some of discord.py's noisier loggers
 logging.getLogger('discord.http').setLevel(logging.WARNING)
@@ -55,11 +61,14 @@ class ForumGuardBot(commands.Bot):
             'cogs.solutions',
             'cogs.escalation'
         ]
+        # Union of monitored forum IDs across all guilds, for fast rejection of unrelated messages
+        self.monitored_parents = set()
 
     async def setup_hook(self):
         # Initialize database
         await db.initialize_database()
         logging.info("Database initialized.")
+        self.monitored_parents.update(await db.get_all_monitored_channels())
 
         # Load cogs
         for cog in self.initial_cogs:
@@ -74,6 +83,11 @@ class ForumGuardBot(commands.Bot):
         await self.tree.sync()
         logging.info("Slash commands synced globally.")
 
+    async def close(self):
+        await super().close()
+        await db.close_database()
+        logging.info("Database connection closed.")
+
     async def on_ready(self):
         logging.info(f'Logged in as {self.user} (ID: {self.user.id})')
         logging.info('------')
@@ -85,3 +99,6 @@ if __name__ == "__main__":
         bot.run(BOT_TOKEN)
     except Exception as e:
         logging.critical(f"Error while running bot: {e}")
+    finally:
+        # Flush any queued records before exiting
+        log_listener.stop()
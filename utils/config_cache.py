@@ -0,0 +1,83 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Optional
+
+from utils import database_handler as db
+
+CACHE_EXPIRY_SECONDS = 300  # 5 minutes
+CACHE_MAX_GUILDS = 10_000
+
+_guild_cache = {}
+# guild_id -> [lock, coroutines using it], so concurrent cache misses share a single database fetch;
+# entries are dropped once nobody holds or waits on the lock
+_fetch_locks = {}
+
+async def get_bundle(guild_id: int) -> Optional[dict]:
+    """Retrieves guild configuration and escalation settings from cache or database."""
+    cache_entry = _get_fresh_entry(guild_id)
+    if cache_entry:
+        return cache_entry['data']
+
+    fetch_lock = _fetch_locks.get(guild_id)
+    if fetch_lock is None:
+        fetch_lock = _fetch_locks[guild_id] = [asyncio.Lock(), 0]
+    fetch_lock[1] += 1
+    try:
+        async with fetch_lock[0]:
+            # Another coroutine may have filled the cache while we waited
+            cache_entry = _get_fresh_entry(guild_id)
+            if cache_entry:
+                return cache_entry['data']
+
+            bundle = await db.get_guild_bundle(guild_id)
+            if bundle:
+                # Store ID collections as frozensets so membership checks need no per-call set building
+                config = bundle['config']
+                config['monitored_channels'] = frozenset(config['monitored_channels'])
+                config['support_roles'] = frozenset(config['support_roles'])
+            if len(_guild_cache) >= CACHE_MAX_GUILDS:
+                # Drop the oldest entry to keep the cache bounded
+                _guild_cache.pop(next(iter(_guild_cache)), None)
+            # Unconfigured guilds are cached too (as None) so they don't cost a query per lookup
+            _guild_cache[guild_id] = {'expiry': time.time() + CACHE_EXPIRY_SECONDS, 'data': bundle}
+            return bundle
+    finally:
+        fetch_lock[1] -= 1
+        if not fetch_lock[1]:
+            _fetch_locks.pop(guild_id, None)
+
+def _get_fresh_entry(guild_id: int) -> Optional[dict]:
+    """Returns the cache entry for a guild if it has not expired."""
+    cache_entry = _guild_cache.get(guild_id)
+    if cache_entry:
+        if cache_entry['expiry'] > time.time():
+            return cache_entry
+        # Expired entries are evicted lazily on access
+        _guild_cache.pop(guild_id, None)
+    return None
+
+async def get_config(guild_id: int) -> Optional[dict]:
+    """Retrieves guild configuration from cache or database."""
+    bundle = await get_bundle(guild_id)
+    return bundle['config'] if bundle else None
+
+async def get_escalation_settings(guild_id: int) -> Optional[dict]:
+    """Retrieves guild escalation settings from cache or database."""
+    bundle = await get_bundle(guild_id)
+    return bundle['escalation'] if bundle else None
+
+def patch(guild_id: int, updater: Callable[[dict], None]):
+    """Applies an in-place update to a cached guild config instead of reloading it from the database."""
+    cache_entry = _guild_cache.get(guild_id)
+    if cache_entry:
+        if cache_entry['data'] is None:
+            # The guild has just been created, so there is nothing to patch; reload it on next access
+            _guild_cache.pop(guild_id, None)
+        else:
+            updater(cache_entry['data']['config'])
+
+def invalidate(guild_id: int):
+    """Clears the configuration cache for a specific guild."""
+    if _guild_cache.pop(guild_id, None) is not None:
+        logging.info(f"Cache cleared for guild ID: {guild_id}")
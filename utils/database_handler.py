@@ -1,251 +1,551 @@
 
 import aiosqlite
 import asyncio
+import contextlib
+import itertools
+import json
 import logging
 import os
-from typing import List, Optional
+import time
+from typing import List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 DB_FILE = os.getenv('DATABASE_PATH', 'database.sqlite3')
 
+# Bits of thread_escalation_state.tier_flags
+TIER_1_FLAG = 1
+TIER_2_FLAG = 2
+
+# Read-through caches for rarely changing lookups; each maps key -> (expiry, value)
+# and is invalidated by the functions that write the underlying rows
+QUERY_CACHE_SECONDS = 300
+QUERY_CACHE_MAX_ENTRIES = 8192
+_solutions_cache = {}        # thread_id -> solutions
+_managed_threads_cache = {}  # thread_id -> is managed
+_forum_tags_cache = {}       # (guild_id, forum_id) -> solution tag IDs
+# Bumped on every invalidation so a read that raced a write doesn't cache the old value
+_cache_epoch = 0
+_MISSING = object()
+
+def _cache_get(cache: dict, key):
+    """Returns a cached value, or _MISSING if it is absent or expired."""
+    entry = cache.get(key)
+    if entry and entry[0] > time.time():
+        return entry[1]
+    return _MISSING
+
+def _cache_put(cache: dict, key, value, epoch: int):
+    """Caches a value read at `epoch`, unless an invalidation happened since."""
+    if epoch != _cache_epoch:
+        return
+    cache.pop(key, None)
+    if len(cache) >= QUERY_CACHE_MAX_ENTRIES:
+        # Drop the oldest entry to keep the cache bounded
+        cache.pop(next(iter(cache)), None)
+    cache[key] = (time.time() + QUERY_CACHE_SECONDS, value)
+
+def _cache_invalidate(cache: dict, key):
+    """Drops a cached value after its rows have changed."""
+    _bump_cache_epoch()
+    cache.pop(key, None)
+
+def _bump_cache_epoch():
+    """Makes every read still in flight skip caching its result."""
+    global _cache_epoch
+    _cache_epoch += 1
+
+# Long-lived connections, so SQLite's statement and page caches are reused. Writes go through
+# _connection; reads use _read_connection, which under WAL only ever sees committed data and
+# doesn't queue behind write batches on the writer's worker thread
+_connection: Optional[aiosqlite.Connection] = None
+_read_connection: Optional[aiosqlite.Connection] = None
+# Serializes write transactions on the shared connection; created with it so it binds to the running loop
+_write_lock: Optional[asyncio.Lock] = None
+
+# Bump when the schema or migrations change so existing databases run them again
+SCHEMA_VERSION = 1
+
+# Per-connection tuning; WAL itself is persistent and set once in initialize_database
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -64000",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA busy_timeout = 5000",
+    # Routine checkpoints run from _checkpoint_loop; this is only a backstop against WAL growth
+    "PRAGMA wal_autocheckpoint = 10000",
+)
+
+# How often the WAL is copied back into the database file off the write path
+WAL_CHECKPOINT_SECONDS = 60
+_checkpoint_task: Optional[asyncio.Task] = None
+
+async def _open_connection(*pragmas: str) -> aiosqlite.Connection:
+    """Opens a tuned autocommit connection; _transaction issues its own BEGIN."""
+    db = await aiosqlite.connect(DB_FILE, isolation_level=None)
+    db.row_factory = aiosqlite.Row
+    for pragma in CONNECTION_PRAGMAS + pragmas:
+        await db.execute(pragma)
+    return db
+
+async def get_connection() -> aiosqlite.Connection:
+    """Returns the shared read-only connection, opening the database on first use."""
+    global _read_connection
+    if _read_connection is None:
+        connection = await _open_connection("PRAGMA query_only = ON")
+        # Another coroutine may have opened it while we were connecting
+        if _read_connection is None:
+            _read_connection = connection
+        else:
+            await connection.close()
+    return _read_connection
+
+async def _get_write_connection() -> aiosqlite.Connection:
+    """Returns the shared connection that all writes go through, opening it on first use."""
+    global _connection, _write_lock, _checkpoint_task
+    if _connection is None:
+        connection = await _open_connection()
+        # Another coroutine may have opened it while we were connecting
+        if _connection is not None:
+            await connection.close()
+            return _connection
+        _connection = connection
+        _write_lock = asyncio.Lock()
+        _checkpoint_task = asyncio.create_task(_checkpoint_loop())
+    return _connection
+
+async def _checkpoint_loop():
+    """Periodically checkpoints the WAL without blocking readers or writers on other connections."""
+    while True:
+        await asyncio.sleep(WAL_CHECKPOINT_SECONDS)
+        try:
+            # Held so the checkpoint never lands inside one of our own open transactions
+            async with _write_lock:
+                await _connection.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        except Exception as e:
+            logger.error(f"WAL checkpoint failed: {e}")
+
+@contextlib.asynccontextmanager
+async def _transaction():
+    """Runs a block of writes on the shared connection as one transaction, committing on success."""
+    db = await _get_write_connection()
+    async with _write_lock:
+        # IMMEDIATE takes the write lock up front, so reads inside the block see the state being written
+        await db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            await db.rollback()
+            # A read that overlapped the failed block must not cache what it saw
+            _bump_cache_epoch()
+            raise
+        await db.commit()
+
+# Single-statement writes queued by _queue_write and committed in batches by _write_worker
+WRITE_BATCH_MAX = 500
+_write_queue: Optional[asyncio.Queue] = None
+_write_worker_task: Optional[asyncio.Task] = None
+
+async def _queue_write(sql: str, params: tuple):
+    """Queues a single-statement write and waits until it has been committed."""
+    global _write_queue, _write_worker_task
+    if _write_queue is None:
+        _write_queue = asyncio.Queue()
+        _write_worker_task = asyncio.create_task(_write_worker())
+    future = asyncio.get_running_loop().create_future()
+    await _write_queue.put((sql, params, future))
+    await future
+
+async def _write_worker():
+    """Commits queued writes so that a burst of them shares one transaction."""
+    while True:
+        # Take whatever piled up while the previous batch was being written
+        batch = [await _write_queue.get()]
+        while len(batch) < WRITE_BATCH_MAX and not _write_queue.empty():
+            batch.append(_write_queue.get_nowait())
+        try:
+            async with _transaction() as db:
+                # Consecutive writes with the same SQL go through one executemany
+                for sql, group in itertools.groupby(batch, key=lambda item: item[0]):
+                    await db.executemany(sql, [params for _, params, _ in group])
+            results = [None] * len(batch)
+        except Exception:
+            # Retry one at a time so a single bad write doesn't fail the rest
+            results = []
+            for sql, params, _ in batch:
+                try:
+                    async with _transaction() as db:
+                        await db.execute(sql, params)
+                    results.append(None)
+                except Exception as e:
+                    results.append(e)
+        for (_, _, future), error in zip(batch, results):
+            if not future.done():
+                if error is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(error)
+            _write_queue.task_done()
+
+async def close_database():
+    """Flushes queued writes and closes the shared database connections."""
+    global _connection, _read_connection, _write_lock, _write_queue, _write_worker_task, _checkpoint_task
+    if _write_queue is not None:
+        await _write_queue.join()
+        _write_worker_task.cancel()
+        _write_queue = None
+        _write_worker_task = None
+    if _checkpoint_task is not None:
+        _checkpoint_task.cancel()
+        _checkpoint_task = None
+    if _read_connection is not None:
+        await _read_connection.close()
+        _read_connection = None
+    if _connection is not None:
+        await _connection.close()
+        _connection = None
+        _write_lock = None
+
 async def initialize_database():
     """Initializes the database and creates tables if they don't exist."""
     async with aiosqlite.connect(DB_FILE) as db:
+        # WAL lets readers proceed during writes and needs fewer fsyncs per commit
+        await db.execute("PRAGMA journal_mode = WAL")
+        
+        # Create and migrate the schema in one exclusive transaction so processes starting together can't interleave
+        await db.execute("BEGIN EXCLUSIVE")
+        async with db.execute("PRAGMA user_version") as cursor:
+            version = (await cursor.fetchone())[0]
+        if version < SCHEMA_VERSION:
+            await _create_schema(db)
+        await db.commit()
+        
+        # Refresh planner statistics on every startup; analysis_limit keeps it cheap on large tables
+        await db.execute("PRAGMA analysis_limit = 1000")
+        await db.execute("ANALYZE")
+
+async def _create_schema(db: aiosqlite.Connection):
+    """Creates the tables and runs migrations within the caller's transaction."""
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS guild_settings (
+            guild_id INTEGER PRIMARY KEY,
+            dm_notifications_enabled BOOLEAN DEFAULT 1
+        )
+    """)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS monitored_channels (
+            guild_id INTEGER,
+            channel_id INTEGER,
+            PRIMARY KEY (guild_id, channel_id),
+            FOREIGN KEY (guild_id) REFERENCES guild_settings(guild_id) ON DELETE CASCADE
+        )
+    """)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS support_roles (
+            guild_id INTEGER,
+            role_id INTEGER,
+            PRIMARY KEY (guild_id, role_id),
+            FOREIGN KEY (guild_id) REFERENCES guild_settings(guild_id) ON DELETE CASCADE
+        )
+    """)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS forum_solution_tags (
+            guild_id INTEGER,
+            forum_id INTEGER,
+            tag_id INTEGER,
+            tag_name TEXT,
+            PRIMARY KEY (guild_id, forum_id, tag_id),
+            FOREIGN KEY (guild_id) REFERENCES guild_settings(guild_id) ON DELETE CASCADE
+        )
+    """)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS thread_solutions (
+            thread_id INTEGER,
+            message_id INTEGER,
+            marked_by INTEGER,
+            marked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            category TEXT DEFAULT 'solution',
+            PRIMARY KEY (thread_id, message_id)
+        )
+    """)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS managed_solution_threads (
+            thread_id INTEGER PRIMARY KEY,
+            managed_since TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            managed_by TEXT DEFAULT 'tag_change'
+        )
+    """)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS guild_escalation_settings (
+            guild_id INTEGER PRIMARY KEY,
+            tier_1_hours INTEGER DEFAULT 24,
+            tier_1_role_id INTEGER,
+            tier_2_hours INTEGER DEFAULT 48,
+            tier_2_role_id INTEGER,
+            escalation_channel_id INTEGER,
+            enabled BOOLEAN DEFAULT 0,
+            escalation_behavior TEXT DEFAULT 'support_only',
+            community_delay_hours INTEGER DEFAULT 12,
+            max_thread_age_days INTEGER DEFAULT 7,
+            FOREIGN KEY (guild_id) REFERENCES guild_settings(guild_id) ON DELETE CASCADE
+        )
+    """)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS thread_escalation_state (
+            thread_id INTEGER PRIMARY KEY,
+            guild_id INTEGER,
+            last_non_op_message TIMESTAMP,
+            last_community_message TIMESTAMP,
+            last_support_message TIMESTAMP,
+            tier_flags INTEGER DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS thread_support_state (
+            thread_id INTEGER PRIMARY KEY,
+            has_support_reply BOOLEAN DEFAULT 0,
+            last_reply_ts INTEGER,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    
+    # Perform any necessary migrations
+    await migrate_database(db)
+    await db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+async def migrate_database(db: aiosqlite.Connection):
+    """Perform database migrations for new columns within the caller's transaction."""
+    # Check if max_thread_age_days column exists
+    cursor = await db.execute("PRAGMA table_info(guild_escalation_settings)")
+    columns = await cursor.fetchall()
+    column_names = [col[1] for col in columns]
+    
+    if 'max_thread_age_days' not in column_names:
+        await db.execute("ALTER TABLE guild_escalation_settings ADD COLUMN max_thread_age_days INTEGER DEFAULT 7")
+        logger.info("Added max_thread_age_days column to guild_escalation_settings table")
+    
+    # Check if updated_at column exists (SQLite cannot add a column with a CURRENT_TIMESTAMP default)
+    cursor = await db.execute("PRAGMA table_info(thread_escalation_state)")
+    columns = await cursor.fetchall()
+    column_names = [col[1] for col in columns]
+    
+    if 'updated_at' not in column_names:
+        await db.execute("ALTER TABLE thread_escalation_state ADD COLUMN updated_at TIMESTAMP")
+        await db.execute("UPDATE thread_escalation_state SET updated_at = CURRENT_TIMESTAMP")
+        logger.info("Added updated_at column to thread_escalation_state table")
+    
+    # Pack the per-tier boolean columns into a single tier_flags bitmap
+    if 'tier_flags' not in column_names:
         await db.execute("""
-            CREATE TABLE IF NOT EXISTS guild_settings (
-                guild_id INTEGER PRIMARY KEY,
-                dm_notifications_enabled BOOLEAN DEFAULT 1
-            )
-        """)
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS monitored_channels (
-                guild_id INTEGER,
-                channel_id INTEGER,
-                PRIMARY KEY (guild_id, channel_id),
-                FOREIGN KEY (guild_id) REFERENCES guild_settings(guild_id) ON DELETE CASCADE
-            )
-        """)
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS support_roles (
-                guild_id INTEGER,
-                role_id INTEGER,
-                PRIMARY KEY (guild_id, role_id),
-                FOREIGN KEY (guild_id) REFERENCES guild_settings(guild_id) ON DELETE CASCADE
-            )
-        """)
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS forum_solution_tags (
-                guild_id INTEGER,
-                forum_id INTEGER,
-                tag_id INTEGER,
-                tag_name TEXT,
-                PRIMARY KEY (guild_id, forum_id, tag_id),
-                FOREIGN KEY (guild_id) REFERENCES guild_settings(guild_id) ON DELETE CASCADE
-            )
-        """)
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS thread_solutions (
-                thread_id INTEGER,
-                message_id INTEGER,
-                marked_by INTEGER,
-                marked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                category TEXT DEFAULT 'solution',
-                PRIMARY KEY (thread_id, message_id)
-            )
-        """)
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS managed_solution_threads (
-                thread_id INTEGER PRIMARY KEY,
-                managed_since TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                managed_by TEXT DEFAULT 'tag_change'
-            )
-        """)
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS guild_escalation_settings (
-                guild_id INTEGER PRIMARY KEY,
-                tier_1_hours INTEGER DEFAULT 24,
-                tier_1_role_id INTEGER,
-                tier_2_hours INTEGER DEFAULT 48,
-                tier_2_role_id INTEGER,
-                escalation_channel_id INTEGER,
-                enabled BOOLEAN DEFAULT 0,
-                escalation_behavior TEXT DEFAULT 'support_only',
-                community_delay_hours INTEGER DEFAULT 12,
-                max_thread_age_days INTEGER DEFAULT 7,
-                FOREIGN KEY (guild_id) REFERENCES guild_settings(guild_id) ON DELETE CASCADE
-            )
-        """)
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS thread_escalation_state (
+            CREATE TABLE thread_escalation_state_new (
                 thread_id INTEGER PRIMARY KEY,
+                guild_id INTEGER,
                 last_non_op_message TIMESTAMP,
                 last_community_message TIMESTAMP,
                 last_support_message TIMESTAMP,
-                tier_1_executed BOOLEAN DEFAULT 0,
-                tier_2_executed BOOLEAN DEFAULT 0
+                tier_flags INTEGER DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
-        await db.commit()
-        
-        # Perform any necessary migrations
-        await migrate_database()
-
-async def migrate_database():
-    """Perform database migrations for new columns."""
-    async with aiosqlite.connect(DB_FILE) as db:
-        # Check if max_thread_age_days column exists
-        cursor = await db.execute("PRAGMA table_info(guild_escalation_settings)")
-        columns = await cursor.fetchall()
-        column_names = [col[1] for col in columns]
-        
-        if 'max_thread_age_days' not in column_names:
-            await db.execute("ALTER TABLE guild_escalation_settings ADD COLUMN max_thread_age_days INTEGER DEFAULT 7")
-            logger.info("Added max_thread_age_days column to guild_escalation_settings table")
-        
-        await db.commit()
+        await db.execute("""
+            INSERT INTO thread_escalation_state_new 
+            (thread_id, last_non_op_message, last_community_message, last_support_message, tier_flags, updated_at)
+            SELECT thread_id, last_non_op_message, last_community_message, last_support_message,
+                   (CASE WHEN tier_1_executed THEN 1 ELSE 0 END) | (CASE WHEN tier_2_executed THEN 2 ELSE 0 END),
+                   COALESCE(updated_at, CURRENT_TIMESTAMP)
+            FROM thread_escalation_state
+        """)
+        await db.execute("DROP TABLE thread_escalation_state")
+        await db.execute("ALTER TABLE thread_escalation_state_new RENAME TO thread_escalation_state")
+        # Legacy rows carry no guild; check_stale_threads fills it in once it sees the live thread
+        logger.info("Migrated thread_escalation_state tier columns to tier_flags")
+    
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_thread_escalation_state_updated_at ON thread_escalation_state (updated_at)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_thread_support_state_updated_at ON thread_support_state (updated_at)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_thread_escalation_state_guild_id ON thread_escalation_state (guild_id)")
+
+async def _ensure_guild(db: aiosqlite.Connection, guild_id: int):
+    """Inserts a default guild_settings row as part of the caller's transaction."""
+    await db.execute("INSERT OR IGNORE INTO guild_settings (guild_id) VALUES (?)", (guild_id,))
 
 async def add_guild_if_not_exists(guild_id: int):
     """Ensures a guild has a default entry in the guild_settings table."""
-    async with aiosqlite.connect(DB_FILE) as db:
-        await db.execute("INSERT OR IGNORE INTO guild_settings (guild_id) VALUES (?)", (guild_id,))
-        await db.commit()
+    async with _transaction() as db:
+        await _ensure_guild(db, guild_id)
 
 async def add_monitored_channel(guild_id: int, channel_id: int) -> bool:
     """Adds a channel to the monitored list for a guild. Returns False if already exists."""
-    await add_guild_if_not_exists(guild_id)
-    async with aiosqlite.connect(DB_FILE) as db:
-        try:
-            await db.execute("INSERT INTO monitored_channels (guild_id, channel_id) VALUES (?, ?)", (guild_id, channel_id))
-            await db.commit()
-            return True
-        except aiosqlite.IntegrityError:
-            return False
+    async with _transaction() as db:
+        await _ensure_guild(db, guild_id)
+        cursor = await db.execute("INSERT OR IGNORE INTO monitored_channels (guild_id, channel_id) VALUES (?, ?)", (guild_id, channel_id))
+        return cursor.rowcount > 0
 
 async def remove_monitored_channel(guild_id: int, channel_id: int) -> bool:
     """Removes a channel from the monitored list. Returns False if it wasn't there."""
-    async with aiosqlite.connect(DB_FILE) as db:
+    async with _transaction() as db:
         cursor = await db.execute("DELETE FROM monitored_channels WHERE guild_id = ? AND channel_id = ?", (guild_id, channel_id))
-        await db.commit()
         return cursor.rowcount > 0
 
+async def get_all_monitored_channels() -> List[int]:
+    """Gets the IDs of every monitored channel across all guilds."""
+    db = await get_connection()
+    async with db.execute("SELECT channel_id FROM monitored_channels") as cursor:
+        rows = await cursor.fetchall()
+    return [row[0] for row in rows]
+
 async def add_support_role(guild_id: int, role_id: int) -> bool:
     """Adds a support role for a guild. Returns False if already exists."""
-    await add_guild_if_not_exists(guild_id)
-    async with aiosqlite.connect(DB_FILE) as db:
-        try:
-            await db.execute("INSERT INTO support_roles (guild_id, role_id) VALUES (?, ?)", (guild_id, role_id))
-            await db.commit()
-            return True
-        except aiosqlite.IntegrityError:
-            return False
+    async with _transaction() as db:
+        await _ensure_guild(db, guild_id)
+        cursor = await db.execute("INSERT OR IGNORE INTO support_roles (guild_id, role_id) VALUES (?, ?)", (guild_id, role_id))
+        return cursor.rowcount > 0
 
 async def remove_support_role(guild_id: int, role_id: int) -> bool:
     """Removes a support role. Returns False if it wasn't there."""
-    async with aiosqlite.connect(DB_FILE) as db:
+    async with _transaction() as db:
         cursor = await db.execute("DELETE FROM support_roles WHERE guild_id = ? AND role_id = ?", (guild_id, role_id))
-        await db.commit()
         return cursor.rowcount > 0
 
 async def set_dm_notifications(guild_id: int, enabled: bool):
     """Sets the DM notification preference for a guild."""
-    await add_guild_if_not_exists(guild_id)
-    async with aiosqlite.connect(DB_FILE) as db:
+    async with _transaction() as db:
+        await _ensure_guild(db, guild_id)
         await db.execute("UPDATE guild_settings SET dm_notifications_enabled = ? WHERE guild_id = ?", (enabled, guild_id))
-        await db.commit()
 
-async def get_guild_config(guild_id: int) -> Optional[dict]:
-    """Fetches the entire configuration for a given guild."""
-    async with aiosqlite.connect(DB_FILE) as db:
-        db.row_factory = aiosqlite.Row
-        
-        # Fetch main settings
-        settings_cursor = await db.execute("SELECT dm_notifications_enabled FROM guild_settings WHERE guild_id = ?", (guild_id,))
+# Columns of the bundle query that belong to the guild config rather than the escalation settings
+_BUNDLE_CONFIG_COLUMNS = frozenset(("dm_notifications_enabled", "monitored_channels", "support_roles"))
+
+async def get_guild_bundle(guild_id: int) -> Optional[dict]:
+    """Fetches a guild's configuration together with its escalation settings."""
+    db = await get_connection()
+    # Fetch main settings, channels, roles and escalation settings in one query
+    # The cursor is closed explicitly so the shared connection never holds a read lock between calls
+    async with db.execute("""
+        SELECT gs.dm_notifications_enabled,
+               (SELECT json_group_array(channel_id) FROM monitored_channels WHERE guild_id = gs.guild_id) AS monitored_channels,
+               (SELECT json_group_array(role_id) FROM support_roles WHERE guild_id = gs.guild_id) AS support_roles,
+               ges.*
+        FROM guild_settings gs
+        LEFT JOIN guild_escalation_settings ges ON ges.guild_id = gs.guild_id
+        WHERE gs.guild_id = ?
+    """, (guild_id,)) as settings_cursor:
         settings = await settings_cursor.fetchone()
-        if not settings:
-            return None
-
-        # Fetch monitored channels
-        channels_cursor = await db.execute("SELECT channel_id FROM monitored_channels WHERE guild_id = ?", (guild_id,))
-        channels = [row['channel_id'] for row in await channels_cursor.fetchall()]
+    if not settings:
+        return None
 
-        # Fetch support roles
-        roles_cursor = await db.execute("SELECT role_id FROM support_roles WHERE guild_id = ?", (guild_id,))
-        roles = [row['role_id'] for row in await roles_cursor.fetchall()]
+    escalation = None
+    if settings['guild_id'] is not None:
+        escalation = {key: settings[key] for key in settings.keys() if key not in _BUNDLE_CONFIG_COLUMNS}
 
-        return {
+    return {
+        "config": {
             "dm_notifications_enabled": settings["dm_notifications_enabled"],
-            "monitored_channels": channels,
-            "support_roles": roles
-        }
+            "monitored_channels": json.loads(settings["monitored_channels"]),
+            "support_roles": json.loads(settings["support_roles"])
+        },
+        "escalation": escalation
+    }
 
 async def add_solution_tag(guild_id: int, forum_id: int, tag_id: int, tag_name: str) -> bool:
     """Adds a solution tag for a forum. Returns False if already exists."""
-    await add_guild_if_not_exists(guild_id)
-    async with aiosqlite.connect(DB_FILE) as db:
-        try:
-            await db.execute("INSERT INTO forum_solution_tags (guild_id, forum_id, tag_id, tag_name) VALUES (?, ?, ?, ?)", 
-                           (guild_id, forum_id, tag_id, tag_name))
-            await db.commit()
-            return True
-        except aiosqlite.IntegrityError:
-            return False
+    async with _transaction() as db:
+        await _ensure_guild(db, guild_id)
+        cursor = await db.execute("INSERT OR IGNORE INTO forum_solution_tags (guild_id, forum_id, tag_id, tag_name) VALUES (?, ?, ?, ?)", 
+                                (guild_id, forum_id, tag_id, tag_name))
+    _cache_invalidate(_forum_tags_cache, (guild_id, forum_id))
+    return cursor.rowcount > 0
 
 async def remove_solution_tag(guild_id: int, forum_id: int, tag_id: int) -> bool:
     """Removes a solution tag. Returns False if it wasn't there."""
-    async with aiosqlite.connect(DB_FILE) as db:
+    async with _transaction() as db:
         cursor = await db.execute("DELETE FROM forum_solution_tags WHERE guild_id = ? AND forum_id = ? AND tag_id = ?", 
                                 (guild_id, forum_id, tag_id))
-        await db.commit()
-        return cursor.rowcount > 0
+    _cache_invalidate(_forum_tags_cache, (guild_id, forum_id))
+    return cursor.rowcount > 0
 
 async def get_forum_solution_tags(guild_id: int, forum_id: int) -> List[int]:
     """Gets all solution tag IDs for a specific forum."""
-    async with aiosqlite.connect(DB_FILE) as db:
-        cursor = await db.execute("SELECT tag_id FROM forum_solution_tags WHERE guild_id = ? AND forum_id = ?", 
-                                (guild_id, forum_id))
+    tag_ids = _cache_get(_forum_tags_cache, (guild_id, forum_id))
+    if tag_ids is not _MISSING:
+        return tag_ids
+
+    epoch = _cache_epoch
+    db = await get_connection()
+    async with db.execute("SELECT tag_id FROM forum_solution_tags WHERE guild_id = ? AND forum_id = ?",
+                          (guild_id, forum_id)) as cursor:
         rows = await cursor.fetchall()
-        return [row[0] for row in rows]
+    tag_ids = [row[0] for row in rows]
+    _cache_put(_forum_tags_cache, (guild_id, forum_id), tag_ids, epoch)
+    return tag_ids
 
 async def get_guild_solution_tags(guild_id: int) -> dict:
     """Gets all solution tags for a guild, organized by forum."""
-    async with aiosqlite.connect(DB_FILE) as db:
-        db.row_factory = aiosqlite.Row
-        cursor = await db.execute("SELECT forum_id, tag_id, tag_name FROM forum_solution_tags WHERE guild_id = ?", 
-                                (guild_id,))
+    db = await get_connection()
+    async with db.execute("SELECT forum_id, tag_id, tag_name FROM forum_solution_tags WHERE guild_id = ?",
+                          (guild_id,)) as cursor:
         rows = await cursor.fetchall()
         
-        result = {}
-        for row in rows:
-            forum_id = row['forum_id']
-            if forum_id not in result:
-                result[forum_id] = []
-            result[forum_id].append({'tag_id': row['tag_id'], 'tag_name': row['tag_name']})
+    result = {}
+    for forum_id, tag_id, tag_name in rows:
+        result.setdefault(forum_id, []).append({'tag_id': tag_id, 'tag_name': tag_name})
         
-        return result
-
-async def add_thread_solution(thread_id: int, message_id: int, marked_by: int, category: str = 'solution'):
-    """Adds a thread solution marker."""
-    async with aiosqlite.connect(DB_FILE) as db:
-        await db.execute("INSERT OR REPLACE INTO thread_solutions (thread_id, message_id, marked_by, category) VALUES (?, ?, ?, ?)",
-                        (thread_id, message_id, marked_by, category))
-        await db.commit()
-
-async def remove_thread_solution(thread_id: int, message_id: int) -> bool:
-    """Removes a thread solution marker. Returns False if it wasn't there."""
-    async with aiosqlite.connect(DB_FILE) as db:
-        cursor = await db.execute("DELETE FROM thread_solutions WHERE thread_id = ? AND message_id = ?", 
-                                (thread_id, message_id))
-        await db.commit()
-        return cursor.rowcount > 0
+    return result
+
+async def add_thread_solution(thread_id: int, message_id: int, marked_by: int, category: str = 'solution',
+                              managed_by: Optional[str] = None) -> bool:
+    """Adds a thread solution marker, optionally marking the thread as managed in the same transaction. Returns False if the message is already marked."""
+    async with _transaction() as db:
+        cursor = await db.execute("INSERT OR IGNORE INTO thread_solutions (thread_id, message_id, marked_by, category) VALUES (?, ?, ?, ?)",
+                                (thread_id, message_id, marked_by, category))
+        added = cursor.rowcount > 0
+        if added and managed_by:
+            await db.execute("INSERT OR IGNORE INTO managed_solution_threads (thread_id, managed_by) VALUES (?, ?)",
+                            (thread_id, managed_by))
+    if added:
+        _cache_invalidate(_solutions_cache, thread_id)
+        if managed_by:
+            _cache_invalidate(_managed_threads_cache, thread_id)
+    return added
+
+async def remove_thread_solution(thread_id: int, message_id: int) -> Tuple[Optional[str], int]:
+    """Removes a thread solution marker. Returns its category (None if it wasn't there) and the number of full solutions left."""
+    async with _transaction() as db:
+        async with db.execute("SELECT category FROM thread_solutions WHERE thread_id = ? AND message_id = ?",
+                              (thread_id, message_id)) as cursor:
+            row = await cursor.fetchone()
+        if not row:
+            return None, 0
+        
+        await db.execute("DELETE FROM thread_solutions WHERE thread_id = ? AND message_id = ?",
+                        (thread_id, message_id))
+        
+        async with db.execute("SELECT COUNT(*) FROM thread_solutions WHERE thread_id = ? AND category = 'solution'",
+                              (thread_id,)) as cursor:
+            remaining = (await cursor.fetchone())[0]
+    _cache_invalidate(_solutions_cache, thread_id)
+    return row[0], remaining
 
 async def get_thread_solutions(thread_id: int) -> List[dict]:
     """Gets all solutions for a thread."""
-    async with aiosqlite.connect(DB_FILE) as db:
-        db.row_factory = aiosqlite.Row
-        cursor = await db.execute("SELECT message_id, marked_by, marked_at, category FROM thread_solutions WHERE thread_id = ?", 
-                                (thread_id,))
+    solutions = _cache_get(_solutions_cache, thread_id)
+    if solutions is not _MISSING:
+        return solutions
+
+    epoch = _cache_epoch
+    db = await get_connection()
+    # marked_at is returned as integer Unix seconds, ready for Discord timestamps
+    async with db.execute("""
+        SELECT message_id, marked_by, CAST(strftime('%s', marked_at) AS INTEGER), category
+        FROM thread_solutions WHERE thread_id = ?
+    """, (thread_id,)) as cursor:
         rows = await cursor.fetchall()
-        return [dict(row) for row in rows]
+    solutions = [
+        {'message_id': message_id, 'marked_by': marked_by, 'marked_at': marked_at, 'category': category}
+        for message_id, marked_by, marked_at, category in rows
+    ]
+    _cache_put(_solutions_cache, thread_id, solutions, epoch)
+    return solutions
 
 # Escalation management functions
 async def set_guild_escalation_settings(guild_id: int, tier_1_hours: int, tier_1_role_id: int, 
@@ -253,8 +553,8 @@ async def set_guild_escalation_settings(guild_id: int, tier_1_hours: int, tier_1
                                        enabled: bool = True, escalation_behavior: str = 'support_only', 
                                        community_delay_hours: int = 12, max_thread_age_days: int = 7):
     """Sets escalation settings for a guild (applies to all monitored forums)."""
-    await add_guild_if_not_exists(guild_id)
-    async with aiosqlite.connect(DB_FILE) as db:
+    async with _transaction() as db:
+        await _ensure_guild(db, guild_id)
         await db.execute("""
             INSERT OR REPLACE INTO guild_escalation_settings 
             (guild_id, tier_1_hours, tier_1_role_id, tier_2_hours, tier_2_role_id, 
@@ -262,156 +562,188 @@ async def set_guild_escalation_settings(guild_id: int, tier_1_hours: int, tier_1
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (guild_id, tier_1_hours, tier_1_role_id, tier_2_hours, tier_2_role_id, 
               escalation_channel_id, enabled, escalation_behavior, community_delay_hours, max_thread_age_days))
-        await db.commit()
-
-async def get_guild_escalation_settings(guild_id: int) -> Optional[dict]:
-    """Gets escalation settings for a guild."""
-    async with aiosqlite.connect(DB_FILE) as db:
-        db.row_factory = aiosqlite.Row
-        cursor = await db.execute("SELECT * FROM guild_escalation_settings WHERE guild_id = ?", 
-                                (guild_id,))
-        row = await cursor.fetchone()
-        return dict(row) if row else None
 
 async def disable_guild_escalation(guild_id: int) -> bool:
     """Disables escalation for a guild. Returns False if no settings exist."""
-    async with aiosqlite.connect(DB_FILE) as db:
+    async with _transaction() as db:
         cursor = await db.execute("UPDATE guild_escalation_settings SET enabled = 0 WHERE guild_id = ?", 
                                 (guild_id,))
-        await db.commit()
-        return cursor.rowcount > 0
+    return cursor.rowcount > 0
 
 async def update_thread_escalation_state(thread_id: int, last_non_op_message: int = None, 
                                         last_community_message: int = None, last_support_message: int = None,
-                                        tier_1_executed: bool = False, tier_2_executed: bool = False):
+                                        tier_flags: int = 0, guild_id: int = None):
     """Updates or creates thread escalation state."""
-    async with aiosqlite.connect(DB_FILE) as db:
-        # Get current state first
-        cursor = await db.execute("SELECT * FROM thread_escalation_state WHERE thread_id = ?", (thread_id,))
-        current = await cursor.fetchone()
-        
-        if current:
-            # Update existing record, preserving values that aren't being changed
-            await db.execute("""
-                UPDATE thread_escalation_state 
-                SET last_non_op_message = COALESCE(?, last_non_op_message),
-                    last_community_message = COALESCE(?, last_community_message),
-                    last_support_message = COALESCE(?, last_support_message),
-                    tier_1_executed = ?,
-                    tier_2_executed = ?
-                WHERE thread_id = ?
-            """, (last_non_op_message, last_community_message, last_support_message, 
-                  tier_1_executed, tier_2_executed, thread_id))
-        else:
-            # Create new record
-            await db.execute("""
-                INSERT INTO thread_escalation_state 
-                (thread_id, last_non_op_message, last_community_message, last_support_message, tier_1_executed, tier_2_executed) 
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (thread_id, last_non_op_message, last_community_message, last_support_message, 
-                  tier_1_executed, tier_2_executed))
-        await db.commit()
+    # Single UPSERT; values that aren't being changed are preserved on update
+    await _queue_write("""
+        INSERT INTO thread_escalation_state 
+        (thread_id, guild_id, last_non_op_message, last_community_message, last_support_message, tier_flags, updated_at) 
+        VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(thread_id) DO UPDATE SET
+            last_non_op_message = COALESCE(excluded.last_non_op_message, last_non_op_message),
+            last_community_message = COALESCE(excluded.last_community_message, last_community_message),
+            last_support_message = COALESCE(excluded.last_support_message, last_support_message),
+            tier_flags = excluded.tier_flags,
+            guild_id = COALESCE(excluded.guild_id, guild_id),
+            updated_at = CURRENT_TIMESTAMP
+    """, (thread_id, guild_id, last_non_op_message, last_community_message, last_support_message, 
+          tier_flags))
 
 async def get_thread_escalation_state(thread_id: int) -> Optional[dict]:
     """Gets escalation state for a thread."""
-    async with aiosqlite.connect(DB_FILE) as db:
-        db.row_factory = aiosqlite.Row
-        cursor = await db.execute("SELECT * FROM thread_escalation_state WHERE thread_id = ?", (thread_id,))
+    db = await get_connection()
+    async with db.execute("""
+        SELECT guild_id, last_non_op_message, last_community_message, last_support_message, tier_flags, updated_at
+        FROM thread_escalation_state WHERE thread_id = ?
+    """, (thread_id,)) as cursor:
         row = await cursor.fetchone()
-        return dict(row) if row else None
+    if row is None:
+        return None
+    guild_id, last_non_op_message, last_community_message, last_support_message, tier_flags, updated_at = row
+    return {
+        'thread_id': thread_id,
+        'guild_id': guild_id,
+        'last_non_op_message': last_non_op_message,
+        'last_community_message': last_community_message,
+        'last_support_message': last_support_message,
+        'tier_flags': tier_flags,
+        'updated_at': updated_at
+    }
+
+async def get_thread_escalation_states_bulk(thread_ids: List[int]) -> dict:
+    """Gets escalation state for many threads at once, keyed by thread ID."""
+    if not thread_ids:
+        return {}
+    db = await get_connection()
+    # Pass the IDs as one JSON parameter so large guilds can't hit SQLite's host-parameter limit
+    async with db.execute("SELECT * FROM thread_escalation_state WHERE thread_id IN (SELECT value FROM json_each(?))", 
+                          (json.dumps(thread_ids),)) as cursor:
+        rows = await cursor.fetchall()
+    return {row['thread_id']: dict(row) for row in rows}
 
-async def mark_escalation_tier_executed(thread_id: int, tier: int):
+async def backfill_thread_guild_ids(guild_id: int, thread_ids: List[int]) -> int:
+    """Assigns a guild to escalation state rows that were migrated without one. Returns rows updated."""
+    async with _transaction() as db:
+        cursor = await db.execute("""
+            UPDATE thread_escalation_state SET guild_id = ?
+            WHERE guild_id IS NULL AND thread_id IN (SELECT value FROM json_each(?))
+        """, (guild_id, json.dumps(thread_ids)))
+    return cursor.rowcount
+
+async def mark_escalation_tier_executed(thread_id: int, tier: int, guild_id: int = None):
     """Marks a specific escalation tier as executed for a thread."""
-    async with aiosqlite.connect(DB_FILE) as db:
-        # Use UPSERT logic to ensure row exists
-        if tier == 1:
-            await db.execute("""
-                INSERT INTO thread_escalation_state (thread_id, tier_1_executed, tier_2_executed) 
-                VALUES (?, 1, 0)
-                ON CONFLICT(thread_id) DO UPDATE SET tier_1_executed = 1
-            """, (thread_id,))
-        elif tier == 2:
-            await db.execute("""
-                INSERT INTO thread_escalation_state (thread_id, tier_1_executed, tier_2_executed) 
-                VALUES (?, 0, 1)
-                ON CONFLICT(thread_id) DO UPDATE SET tier_2_executed = 1
-            """, (thread_id,))
-        await db.commit()
+    flag = 1 << (tier - 1)
+    # Use UPSERT logic to ensure row exists
+    await _queue_write("""
+        INSERT INTO thread_escalation_state (thread_id, guild_id, tier_flags, updated_at)
+        VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(thread_id) DO UPDATE SET tier_flags = tier_flags | excluded.tier_flags,
+                                             guild_id = COALESCE(excluded.guild_id, guild_id),
+                                             updated_at = CURRENT_TIMESTAMP
+    """, (thread_id, guild_id, flag))
 
 async def set_guild_escalation_behavior(guild_id: int, behavior: str, community_delay_hours: int = 12):
     """Updates escalation behavior for a guild."""
-    async with aiosqlite.connect(DB_FILE) as db:
+    async with _transaction() as db:
         await db.execute("""
             UPDATE guild_escalation_settings 
             SET escalation_behavior = ?, community_delay_hours = ?
             WHERE guild_id = ?
         """, (behavior, community_delay_hours, guild_id))
-        await db.commit()
 
 async def reset_thread_escalation_state(thread_id: int):
     """Resets escalation state when thread gets activity."""
-    async with aiosqlite.connect(DB_FILE) as db:
-        await db.execute("DELETE FROM thread_escalation_state WHERE thread_id = ?", (thread_id,))
-        await db.commit()
+    await _queue_write("DELETE FROM thread_escalation_state WHERE thread_id = ?", (thread_id,))
 
-async def reset_all_escalation_states(guild_id: int) -> int:
+async def reset_all_escalation_states(guild_id: int, thread_ids: List[int] = ()) -> int:
     """Resets escalation state for all threads in a guild. Returns count of reset threads."""
-    async with aiosqlite.connect(DB_FILE) as db:
-        # Get count of threads that will be reset
+    # Rows migrated without a guild are matched through the guild's live thread IDs instead
+    async with _transaction() as db:
         cursor = await db.execute("""
-            SELECT COUNT(*) FROM thread_escalation_state tes
-            WHERE EXISTS (
-                SELECT 1 FROM guild_escalation_settings ges 
-                WHERE ges.guild_id = ? AND ges.enabled = 1
-            )
-        """, (guild_id,))
-        count = (await cursor.fetchone())[0]
-        
-        # Reset all escalation states for threads in this guild's monitored forums
-        await db.execute("""
-            DELETE FROM thread_escalation_state 
-            WHERE thread_id IN (
-                SELECT tes.thread_id FROM thread_escalation_state tes
-                WHERE EXISTS (
-                    SELECT 1 FROM guild_escalation_settings ges 
-                    WHERE ges.guild_id = ? AND ges.enabled = 1
-                )
-            )
-        """, (guild_id,))
-        await db.commit()
-        return count
+            DELETE FROM thread_escalation_state
+            WHERE guild_id = ?
+            OR (guild_id IS NULL AND thread_id IN (SELECT value FROM json_each(?)))
+        """, (guild_id, json.dumps(list(thread_ids))))
+    return cursor.rowcount
+
+
+async def get_thread_support_state(thread_id: int) -> Optional[dict]:
+    """Gets the recorded support reply state for a thread."""
+    db = await get_connection()
+    async with db.execute("SELECT has_support_reply, last_reply_ts FROM thread_support_state WHERE thread_id = ?", 
+                          (thread_id,)) as cursor:
+        row = await cursor.fetchone()
+    if row is None:
+        return None
+    has_support_reply, last_reply_ts = row
+    return {'has_support_reply': has_support_reply, 'last_reply_ts': last_reply_ts}
+
+async def set_thread_support_replied(thread_id: int, reply_ts: int):
+    """Records that a support member has replied in a thread."""
+    await _queue_write("""
+        INSERT INTO thread_support_state (thread_id, has_support_reply, last_reply_ts)
+        VALUES (?, 1, ?)
+        ON CONFLICT(thread_id) DO UPDATE SET has_support_reply = 1, last_reply_ts = excluded.last_reply_ts,
+                                             updated_at = CURRENT_TIMESTAMP
+    """, (thread_id, reply_ts))
+
+async def init_thread_support_state(thread_id: int, has_support_reply: Optional[bool], reply_ts: int = None):
+    """Stores the backfilled support reply state (None if unknown) for a thread without overwriting a live update."""
+    await _queue_write("INSERT OR IGNORE INTO thread_support_state (thread_id, has_support_reply, last_reply_ts) VALUES (?, ?, ?)",
+                       (thread_id, has_support_reply, reply_ts))
+
+
+async def prune_thread_states(max_age_days: int, active_thread_ids: List[int]) -> int:
+    """Deletes escalation and support state not touched for max_age_days, keeping active threads. Returns rows deleted."""
+    cutoff = f"-{max_age_days} days"
+    active = json.dumps(active_thread_ids)
+    deleted = 0
+    async with _transaction() as db:
+        for table in ("thread_escalation_state", "thread_support_state"):
+            cursor = await db.execute(f"""
+                DELETE FROM {table}
+                WHERE updated_at < datetime('now', ?)
+                AND thread_id NOT IN (SELECT value FROM json_each(?))
+            """, (cutoff, active))
+            deleted += cursor.rowcount
+    return deleted
 
 
 async def add_managed_solution_thread(thread_id: int, managed_by: str = 'tag_change'):
     """Marks a thread as managed by the bot for solution tag tracking."""
-    async with aiosqlite.connect(DB_FILE) as db:
-        await db.execute("INSERT OR IGNORE INTO managed_solution_threads (thread_id, managed_by) VALUES (?, ?)",
-                        (thread_id, managed_by))
-        await db.commit()
+    await _queue_write("INSERT OR IGNORE INTO managed_solution_threads (thread_id, managed_by) VALUES (?, ?)",
+                       (thread_id, managed_by))
+    _cache_invalidate(_managed_threads_cache, thread_id)
 
 
 async def remove_managed_solution_thread(thread_id: int):
     """Removes a thread from bot management for solution tag tracking."""
-    async with aiosqlite.connect(DB_FILE) as db:
-        await db.execute("DELETE FROM managed_solution_threads WHERE thread_id = ?", (thread_id,))
-        await db.commit()
+    await _queue_write("DELETE FROM managed_solution_threads WHERE thread_id = ?", (thread_id,))
+    _cache_invalidate(_managed_threads_cache, thread_id)
 
 
 async def is_thread_managed(thread_id: int) -> bool:
     """Checks if a thread is managed by the bot for solution tag tracking."""
-    async with aiosqlite.connect(DB_FILE) as db:
-        cursor = await db.execute("SELECT 1 FROM managed_solution_threads WHERE thread_id = ? LIMIT 1", (thread_id,))
-        result = await cursor.fetchone()
-        return result is not None
+    managed = _cache_get(_managed_threads_cache, thread_id)
+    if managed is not _MISSING:
+        return managed
+
+    epoch = _cache_epoch
+    db = await get_connection()
+    async with db.execute("SELECT EXISTS(SELECT 1 FROM managed_solution_threads WHERE thread_id = ?)", (thread_id,)) as cursor:
+        managed = (await cursor.fetchone())[0] == 1
+    _cache_put(_managed_threads_cache, thread_id, managed, epoch)
+    return managed
 
 
 async def get_managed_threads_count(guild_id: int = None) -> int:
     """Gets the count of managed solution threads, optionally filtered by guild."""
-    async with aiosqlite.connect(DB_FILE) as db:
-        if guild_id:
-            # This would require joining with thread data - for now just return total count
-            cursor = await db.execute("SELECT COUNT(*) FROM managed_solution_threads")
-        else:
-            cursor = await db.execute("SELECT COUNT(*) FROM managed_solution_threads")
+    db = await get_connection()
+    if guild_id:
+        # This would require joining with thread data - for now just return total count
+        query = "SELECT COUNT(*) FROM managed_solution_threads"
+    else:
+        query = "SELECT COUNT(*) FROM managed_solution_threads"
+    async with db.execute(query) as cursor:
         result = await cursor.fetchone()
-        return result[0] if result else 0
+    return result[0] if result else 0
@@ -1,127 +1,135 @@
 import discord
 from typing import List
 
-SUCCESS_COLOR = discord.Color.green()
-ERROR_COLOR = discord.Color.red()
-INFO_COLOR = discord.Color.blue()
+# Raw color values (discord.Color.green/red/blue); embeds accept ints directly
+SUCCESS_COLOR = 0x2ecc71
+ERROR_COLOR = 0xe74c3c
+INFO_COLOR = 0x3498db
 
-def simple_embed(title: str, message: str, color: discord.Color) -> discord.Embed:
-    """Creates a simple, standardized embed."""
-    embed = discord.Embed(title=title, description=message, color=color)
-    return embed
+SUCCESS_PREFIX = ":white_check_mark: "
+ERROR_PREFIX = ":x: "
+INFO_PREFIX = ":information_source: "
+
+def preview(text: str, limit: int = 100) -> str:
+    """Truncates text to a preview of at most `limit` characters plus an ellipsis."""
+    return text if len(text) <= limit else f"{text[:limit]}…"
 
 def success_embed(title: str, message: str) -> discord.Embed:
     """Creates a success-themed embed."""
-    return simple_embed(f":white_check_mark: {title}", message, SUCCESS_COLOR)
+    return discord.Embed(title=SUCCESS_PREFIX + title, description=message, color=SUCCESS_COLOR)
 
 def error_embed(title: str, message: str) -> discord.Embed:
     """Creates an error-themed embed."""
-    return simple_embed(f":x: {title}", message, ERROR_COLOR)
+    return discord.Embed(title=ERROR_PREFIX + title, description=message, color=ERROR_COLOR)
 
 def info_embed(title: str, message: str) -> discord.Embed:
     """Creates an info-themed embed."""
-    return simple_embed(f":information_source: {title}", message, INFO_COLOR)
+    return discord.Embed(title=INFO_PREFIX + title, description=message, color=INFO_COLOR)
+
+# Indexed by whether DM notifications are enabled
+_DM_STATUS = ("Disabled", "Enabled")
 
 def view_settings_embed(guild: discord.Guild, config: dict) -> discord.Embed:
     """Creates a detailed embed to display a guild's current settings."""
-    embed = discord.Embed(
-        title=f"ForumGuard Settings for {guild.name}",
-        color=INFO_COLOR
-    )
-
     # Monitored Channels
-    channel_mentions = [f'<#{cid}>' for cid in config.get('monitored_channels', [])]
-    channel_text = '\n'.join(channel_mentions) if channel_mentions else "None"
-    embed.add_field(name="Monitored Forum Channels", value=channel_text, inline=False)
+    # The IDs are cached as frozensets, so sort them for a stable listing
+    channel_text = '\n'.join(f'<#{cid}>' for cid in sorted(config.get('monitored_channels', ()))) or "None"
 
     # Support Roles
-    role_mentions = [f'<@&{rid}>' for rid in config.get('support_roles', [])]
-    role_text = '\n'.join(role_mentions) if role_mentions else "None"
-    embed.add_field(name="Support Roles", value=role_text, inline=False)
+    role_text = '\n'.join(f'<@&{rid}>' for rid in sorted(config.get('support_roles', ()))) or "None"
 
     # DM Notifications
     dms_enabled = config.get('dm_notifications_enabled', True)
-    dm_status = "Enabled" if dms_enabled else "Disabled"
-    embed.add_field(name="DM Notifications on Reply Deletion", value=dm_status, inline=False)
+    dm_status = _DM_STATUS[bool(dms_enabled)]
 
-    embed.set_footer(text=f"Guild ID: {guild.id}")
-    return embed
+    return discord.Embed.from_dict({
+        'title': f"ForumGuard Settings for {guild.name}",
+        'color': INFO_COLOR,
+        'fields': [
+            {'name': "Monitored Forum Channels", 'value': channel_text, 'inline': False},
+            {'name': "Support Roles", 'value': role_text, 'inline': False},
+            {'name': "DM Notifications on Reply Deletion", 'value': dm_status, 'inline': False}
+        ],
+        'footer': {'text': f"Guild ID: {guild.id}"}
+    })
+
+DM_NOTIFICATION_MESSAGE = (
+    "Your message in the thread `\"{name}\"` was automatically removed.\n\n"
+    "In this server, replies in monitored forum posts are restricted to the original poster "
+    "and designated support roles to keep the discussion focused.\n\n"
+    "If you believe this was an error, please contact a server moderator."
+)
 
 def dm_notification_embed(thread: discord.Thread) -> discord.Embed:
     """Creates the embed sent to a user whose message was deleted."""
-    message = (
-        f"Your message in the thread `\"{thread.name}\"` was automatically removed.\n\n"
-        + f"In this server, replies in monitored forum posts are restricted to the original poster "
-        + f"and designated support roles to keep the discussion focused.\n\n"
-        + f"If you believe this was an error, please contact a server moderator."
-    )
-    embed = discord.Embed(
-        title="Message Removed",
-        description=message,
-        color=ERROR_COLOR
-    )
-    embed.set_footer(text=f"Server: {thread.guild.name}")
-    return embed
+    # The payload is built fresh each call since Embed.from_dict keeps nested dicts by reference
+    return discord.Embed.from_dict({
+        'title': "Message Removed",
+        'description': DM_NOTIFICATION_MESSAGE.format(name=thread.name),
+        'color': ERROR_COLOR,
+        'footer': {'text': f"Server: {thread.guild.name}"}
+    })
+
+# Thread lifecycle embeds have fixed content, so they are rebuilt from these dicts
+_THREAD_CLOSED_EMBED = {
+    'title': "Thread Closed",
+    'description': (
+        "🔒 This thread has been marked as solved and archived.\n\n"
+        "If you need further help, please create a new thread."
+    ),
+    'color': SUCCESS_COLOR
+}
+_THREAD_REOPENED_EMBED = {
+    'title': "Thread Reopened",
+    'description': (
+        "🔓 This thread has been reopened.\n\n"
+        "The solution tag was removed and the thread is now active again."
+    ),
+    'color': INFO_COLOR
+}
 
 def thread_closed_embed(user: discord.Member) -> discord.Embed:
     """Creates the embed posted when a thread is automatically closed."""
-    message = (
-        "🔒 This thread has been marked as solved and archived.\n\n"
-        + "If you need further help, please create a new thread."
-    )
-    embed = discord.Embed(
-        title="Thread Closed",
-        description=message,
-        color=SUCCESS_COLOR
-    )
+    embed = discord.Embed.from_dict(_THREAD_CLOSED_EMBED)
     embed.set_footer(text=f"Marked as solved by {user.display_name}")
     return embed
 
 def thread_reopened_embed() -> discord.Embed:
     """Creates the embed posted when a thread is automatically reopened."""
-    message = (
-        "🔓 This thread has been reopened.\n\n"
-        + "The solution tag was removed and the thread is now active again."
-    )
-    embed = discord.Embed(
-        title="Thread Reopened",
-        description=message,
-        color=INFO_COLOR
-    )
-    return embed
+    return discord.Embed.from_dict(_THREAD_REOPENED_EMBED)
+
+# category -> (emoji, title) for solution announcements
+_CATEGORY_META = {
+    'solution': ("✅", "Solution"),
+    'helpful': ("💡", "Helpful Answer")
+}
 
 def solution_marked_embed(message: discord.Message, marked_by: discord.Member, category: str) -> discord.Embed:
     """Creates the embed posted when a message is marked as a solution."""
-    category_emoji = "✅" if category == "solution" else "💡"
-    category_title = "Solution" if category == "solution" else "Helpful Answer"
+    category_emoji, category_title = _CATEGORY_META.get(category, _CATEGORY_META['helpful'])
     
-    embed = discord.Embed(
-        title=f"{category_emoji} {category_title} Marked",
-        description=f"A message by {message.author.mention} has been marked as a {category} by {marked_by.mention}.",
-        color=SUCCESS_COLOR
-    )
+    message_preview = preview(message.content, 200)
     
-    message_preview = message.content[:200] + "..." if len(message.content) > 200 else message.content
-    embed.add_field(name="Message", value=f"[Jump to message]({message.jump_url})\n{message_preview}", inline=False)
-    
-    return embed
+    return discord.Embed.from_dict({
+        'title': f"{category_emoji} {category_title} Marked",
+        'description': f"A message by {message.author.mention} has been marked as a {category} by {marked_by.mention}.",
+        'color': SUCCESS_COLOR,
+        'fields': [
+            {'name': "Message", 'value': f"[Jump to message]({message.jump_url})\n{message_preview}", 'inline': False}
+        ]
+    })
 
 def solution_closure_suggestion_embed(solution_message: discord.Message) -> discord.Embed:
     """Creates the embed suggesting thread closure after a solution is marked."""
-    embed = discord.Embed(
-        title="💡 Consider Marking as Solved",
-        description=(
+    return discord.Embed.from_dict({
+        'title': "💡 Consider Marking as Solved",
+        'description': (
             "A solution has been marked in this thread! If this resolves your issue, "
             "consider applying a solution tag to close and archive this thread.\n\n"
             "This will help keep the forum organized and let others know the issue is resolved."
         ),
-        color=INFO_COLOR
-    )
-    
-    embed.add_field(
-        name="Marked Solution", 
-        value=f"[Jump to solution]({solution_message.jump_url})", 
-        inline=False
-    )
-    
-    return embed
\ No newline at end of file
+        'color': INFO_COLOR,
+        'fields': [
+            {'name': "Marked Solution", 'value': f"[Jump to solution]({solution_message.jump_url})", 'inline': False}
+        ]
+    })
\ No newline at end of file